@@ -0,0 +1,24 @@
+"""
+Ponto de entrada para executar a API com `python -m app`.
+"""
+import uvicorn
+
+from app.config import get_settings
+
+
+def main():
+    settings = get_settings()
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        loop="uvloop",
+        http="httptools",
+        # Mantém o logging configurado por setup_logging()
+        log_config=None
+    )
+
+
+if __name__ == "__main__":
+    main()
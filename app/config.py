@@ -1,21 +1,105 @@
+import atexit
 import logging
-import os
-from typing import Dict, Any
+import queue
+from functools import lru_cache
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from typing import List, Optional, Union
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Configurações da aplicação, lidas do ambiente e do arquivo .env.
+    """
+    mongodb_url: str = "mongodb://localhost:27017"
+    database_name: str = "pokemon_db"
+    mongo_pool_size: int = 200
+    mongo_min_pool_size: int = 0
+    mongo_compressors: str = "zstd,zlib"
+    mongo_write_concern: str = "1"
+    mongo_journal: Optional[bool] = None
+    run_migrations: bool = False
+    pokemon_mcp_url: Optional[str] = None
+    mongodb_mcp_url: Optional[str] = None
+    pokemon_cache_size: int = 4096
+    pokemon_cache_ttl: float = 86400.0
+    pokemon_cache_negative_ttl: float = 30.0
+    health_cache_ttl: float = 10.0
+    log_level: str = "INFO"
+    log_buffer_size: int = 1000
+    log_flush_interval: float = 1.0
+    pipeline_log_level: Optional[str] = None
+    environment: str = "development"
+    allowed_origins: str = ""
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+
+    model_config = SettingsConfigDict(env_file=".env", frozen=True, extra="ignore")
+
+    @property
+    def mongo_write_concern_w(self) -> Union[int, str]:
+        """
+        Write concern "w" do MongoDB: número de nós ou um modo como "majority".
+        """
+        return int(self.mongo_write_concern) if self.mongo_write_concern.isdigit() else self.mongo_write_concern
+
+    @property
+    def cors_origins(self) -> List[str]:
+        """
+        Origens liberadas para CORS, a partir da lista separada por vírgulas.
+        """
+        return [origin.strip() for origin in self.allowed_origins.split(",") if origin.strip()]
+
+
+# Listener que escreve os registros de log fora do event loop
+_log_listener: Optional[QueueListener] = None
+# Buffer em memória entre o listener e o stderr
+_log_buffer: Optional[MemoryHandler] = None
 
 
 def setup_logging():
     """
     Configura o sistema de logging da aplicação.
+    Os registros são enfileirados por um QueueHandler e escritos no stderr
+    por uma thread dedicada (QueueListener), sem bloquear o event loop.
+    O listener acumula os registros em um MemoryHandler, descarregado quando
+    enche, em registros de ERROR ou periodicamente via flush_logs().
     """
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-    
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(),
-        ]
-    )
+    global _log_listener, _log_buffer
+
+    settings = get_settings()
+    log_level = settings.log_level.upper()
+
+    if _log_listener is None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        # A formatação completa é feita pelo handler de destino
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        _log_buffer = MemoryHandler(
+            capacity=settings.log_buffer_size,
+            flushLevel=logging.ERROR,
+            target=stream_handler
+        )
+        atexit.register(_log_buffer.close)
+
+        _log_listener = QueueListener(log_queue, _log_buffer, respect_handler_level=True)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
+        logging.basicConfig(
+            level=getattr(logging, log_level),
+            handlers=[
+                queue_handler,
+            ]
+        )
     
     # Configurar loggers específicos
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -23,16 +107,23 @@ def setup_logging():
     logging.getLogger("motor").setLevel(logging.WARNING)
     logging.getLogger("pymongo").setLevel(logging.WARNING)
 
+    if settings.pipeline_log_level:
+        logging.getLogger("app.routers.pipeline").setLevel(settings.pipeline_log_level.upper())
+
+
+def flush_logs():
+    """
+    Descarrega os registros de log acumulados no buffer.
+    """
+    if _log_buffer is not None:
+        _log_buffer.flush()
+
 
-def get_settings() -> Dict[str, Any]:
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
     """
     Retorna as configurações da aplicação.
+    A instância é criada uma única vez e é imutável;
+    use get_settings.cache_clear() para recarregar.
     """
-    return {
-        "mongodb_url": os.getenv("MONGODB_URL", "mongodb://localhost:27017"),
-        "database_name": os.getenv("DATABASE_NAME", "pokemon_db"),
-        "pokemon_mcp_url": os.getenv("POKEMON_MCP_URL"),
-        "mongodb_mcp_url": os.getenv("MONGODB_MCP_URL"),
-        "log_level": os.getenv("LOG_LEVEL", "INFO"),
-        "environment": os.getenv("ENVIRONMENT", "development")
-    }
+    return Settings()
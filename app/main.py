@@ -1,64 +1,150 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from contextlib import asynccontextmanager
+from pathlib import Path
+import asyncio
 import os
-from dotenv import load_dotenv
+
+import httpx
 
 from app.routers import pokemon, pipeline
 from app.services.database import DatabaseService
-from app.config import setup_logging
-
-# Load environment variables
-load_dotenv()
+from app.services.file_processor import FileProcessorMCP
+from app.services.stream_processor import StreamProcessorMCP
+from app.services.dashboard_service import DashboardService
+from app.services.alert_system import AlertSystem
+from app.services.agnos_client import AgnosClient
+from app.services.pokemon_service import PokemonService
+from app.config import setup_logging, get_settings, flush_logs
 
 # Setup logging
 setup_logging()
 
+PIPELINE_DATA_DIRS = ("data/exports", "data/reports", "data/dashboards", "data/alerts", "data/temp")
+
 
 @asynccontextmanager
-async def lifespan(app: FastAPI):
-    # Startup
-    print("Starting Pokemon Agent API with Pipeline...")
+async def log_flush_lifespan(app: FastAPI):
+    """Descarrega periodicamente o buffer de logs."""
+    interval = get_settings().log_flush_interval
+
+    async def flush_periodically():
+        while True:
+            await asyncio.sleep(interval)
+            flush_logs()
+
+    flush_task = asyncio.create_task(flush_periodically())
+    try:
+        yield
+    finally:
+        flush_task.cancel()
+        flush_logs()
+
 
-    # Initialize database connection
-    global database_service
-    database_service = DatabaseService()
-    await database_service.connect()
-    app.state.db_service = database_service
+@asynccontextmanager
+async def db_lifespan(app: FastAPI):
+    """Abre e fecha a conexão com o banco de dados."""
+    db_service = DatabaseService()
+    await db_service.connect()
+    app.state.db_service = db_service
+    try:
+        yield
+    finally:
+        await app.state.db_service.disconnect()
 
-    # Create data directories
-    from pathlib import Path
-    data_dirs = ["data/exports", "data/reports", "data/dashboards", "data/alerts", "data/temp"]
-    for dir_path in data_dirs:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
 
-    print("✅ Pipeline services initialized")
+@asynccontextmanager
+async def http_client_lifespan(app: FastAPI):
+    """Mantém um único cliente HTTP, com pool de conexões, e o AgnosClient que o usa."""
+    app.state.http_client = httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        http2=True
+    )
+    app.state.agnos_client = AgnosClient(app.state.http_client)
+    try:
+        yield
+    finally:
+        await app.state.http_client.aclose()
+
 
+@asynccontextmanager
+async def pokemon_service_lifespan(app: FastAPI):
+    """Cria a instância única do serviço de pokémons."""
+    app.state.pokemon_service = PokemonService(app.state.db_service, app.state.agnos_client)
     yield
 
-    # Shutdown
-    print("Shutting down Pokemon Agent API...")
-    if hasattr(app.state, 'db_service'):
-        await app.state.db_service.disconnect()
+
+@asynccontextmanager
+async def pipeline_dirs_lifespan(app: FastAPI):
+    """Cria os diretórios de dados usados pela pipeline."""
+    created_dirs = getattr(app.state, "created_dirs", set())
+    pending = [Path(p) for p in PIPELINE_DATA_DIRS if p not in created_dirs]
+    if pending:
+        await asyncio.gather(*(
+            asyncio.to_thread(dir_path.mkdir, parents=True, exist_ok=True)
+            for dir_path in pending
+        ))
+        created_dirs.update(PIPELINE_DATA_DIRS)
+    app.state.created_dirs = created_dirs
+    yield
+
+
+@asynccontextmanager
+async def pipeline_services_lifespan(app: FastAPI):
+    """Cria as instâncias únicas dos serviços da pipeline."""
+    db_service = app.state.db_service
+    app.state.alert_system = AlertSystem()
+    app.state.stream_processor = StreamProcessorMCP(db_service, app.state.alert_system)
+    app.state.file_processor = FileProcessorMCP(db_service)
+    app.state.dashboard_service = DashboardService(db_service)
+    try:
+        yield
+    finally:
+        await app.state.stream_processor.stop_stream_processing()
+        await app.state.alert_system.close()
+
+
+@asynccontextmanager
+async def merged_lifespan(app: FastAPI):
+    # Startup
+    print("Starting Pokemon Agent API with Pipeline...")
+
+    async with log_flush_lifespan(app):
+        async with db_lifespan(app):
+            async with http_client_lifespan(app):
+                async with pokemon_service_lifespan(app):
+                    async with pipeline_dirs_lifespan(app):
+                        async with pipeline_services_lifespan(app):
+                            print("✅ Pipeline services initialized")
+
+                            yield
+
+                            # Shutdown
+                            print("Shutting down Pokemon Agent API...")
 
 
 app = FastAPI(
     title="Pokemon Agent API",
     description="API para buscar e armazenar informações de Pokémons usando MCPs",
     version="1.0.0",
-    lifespan=lifespan
+    default_response_class=ORJSONResponse,
+    lifespan=merged_lifespan
 )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Configure CORS (only when origins are allowed; the static dashboard is
+# same-origin, the React frontend in frontend/ needs its origin in ALLOWED_ORIGINS)
+cors_origins = get_settings().cors_origins
+if cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -87,10 +173,6 @@ async def health_check():
     return {"status": "healthy"}
 
 
-# Global database service instance for dependencies
-database_service = None
-
-
 # Dependency to get database service
-async def get_db_service():
-    return app.state.db_service
+def get_db_service(request: Request):
+    return request.app.state.db_service
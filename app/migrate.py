@@ -0,0 +1,33 @@
+"""
+Migração do banco com `python -m app.migrate`: cria os índices da coleção
+de pokémons e remove os obsoletos. Execute uma vez por deploy.
+"""
+import asyncio
+import logging
+
+from app.config import flush_logs, setup_logging
+from app.services.database import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate():
+    db_service = DatabaseService()
+    await db_service.connect(create_indexes=False)
+    try:
+        await db_service.create_indexes()
+    finally:
+        await db_service.disconnect()
+
+
+def main():
+    setup_logging()
+    try:
+        asyncio.run(migrate())
+        logger.info("Migration completed")
+    finally:
+        flush_logs()
+
+
+if __name__ == "__main__":
+    main()
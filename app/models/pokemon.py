@@ -1,9 +1,12 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import UTC, datetime
+import sys
 
 
 class PokemonStats(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
     hp: int
     attack: int
     defense: int
@@ -11,14 +14,17 @@ class PokemonStats(BaseModel):
     special_defense: int = Field(alias="special-defense")
     speed: int
 
-    class Config:
-        populate_by_name = True
-
 
 class PokemonType(BaseModel):
     name: str
     url: str
 
+    @field_validator("name")
+    @classmethod
+    def intern_name(cls, value: str) -> str:
+        # Poucos nomes de tipo distintos: todas as instâncias compartilham a mesma string
+        return sys.intern(value)
+
 
 class PokemonAbility(BaseModel):
     name: str
@@ -34,6 +40,8 @@ class PokemonSprite(BaseModel):
 
 
 class Pokemon(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
     id: int
     name: str
     height: int
@@ -43,14 +51,22 @@ class Pokemon(BaseModel):
     abilities: List[PokemonAbility]
     stats: PokemonStats
     sprites: PokemonSprite
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    # Atributo privado: é comparado no __eq__, mas como deriva de types não
+    # altera a igualdade entre instâncias (um cached_property no __dict__ alteraria)
+    _type_names: Tuple[str, ...] = PrivateAttr(default=())
+
+    def model_post_init(self, __context: Any) -> None:
+        self._type_names = tuple(t.name for t in self.types)
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    @property
+    def type_names(self) -> Tuple[str, ...]:
+        """
+        Nomes dos tipos do pokémon, calculados uma vez, na criação da instância.
+        """
+        return self._type_names
 
 
 class PokemonResponse(BaseModel):
@@ -64,3 +80,5 @@ class PokemonListResponse(BaseModel):
     message: str
     data: List[Pokemon] = []
     total: int = 0
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
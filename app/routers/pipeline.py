@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, UploadFile, File
-from fastapi.responses import FileResponse, HTMLResponse
-from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, UploadFile, File, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from typing import Dict, Any, List, Optional, Callable, Coroutine
+import hashlib
 import logging
+import os
+import orjson
 from pathlib import Path
-import shutil
 import tempfile
 
+import aiofiles
+
 from app.services.database import DatabaseService
 from app.services.file_processor import FileProcessorMCP
 from app.services.stream_processor import StreamProcessorMCP
@@ -14,54 +21,93 @@ from app.services.alert_system import AlertSystem
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/pipeline", tags=["Pipeline"])
 
-# Instâncias globais dos serviços (serão inicializadas no startup)
-stream_processor: Optional[StreamProcessorMCP] = None
-file_processor: Optional[FileProcessorMCP] = None
-dashboard_service: Optional[DashboardService] = None
-alert_system: Optional[AlertSystem] = None
+class PipelineRoute(APIRoute):
+    """
+    Rota que converte erros inesperados dos endpoints da pipeline em HTTP 500,
+    registrando-os em um único ponto em vez de um try/except por endpoint.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def pipeline_route_handler(request: Request) -> Response:
+            try:
+                return await route_handler(request)
+            except (HTTPException, RequestValidationError):
+                raise
+            except Exception as e:
+                # Evita montar o registro e o traceback quando o nível está silenciado
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error("Erro em %s %s: %s", request.method, request.url.path, e, exc_info=True)
+                return JSONResponse(status_code=500, content={"detail": str(e)})
+
+        return pipeline_route_handler
+
+
+router = APIRouter(prefix="/api/v1/pipeline", tags=["Pipeline"], route_class=PipelineRoute)
 
+# Tamanho dos blocos lidos no upload de arquivos (1 MiB)
+UPLOAD_CHUNK_SIZE = 1 << 20
 
-def get_database_service():
+# Diretórios servidos pela rota de download, por tipo de arquivo
+DOWNLOAD_DIRS: Dict[str, Path] = {
+    "exports": Path("data/exports"),
+    "reports": Path("data/reports"),
+    "dashboards": Path("data/dashboards"),
+    "alerts": Path("data/alerts"),
+}
+
+
+def _conditional_json(request: Request, content: Dict[str, Any]) -> Response:
+    """
+    Serializa a resposta (com as mesmas opções do ORJSONResponse) com ETag e
+    responde 304 quando o cliente já possui o mesmo conteúdo.
+    """
+    return _conditional_json_body(
+        request,
+        orjson.dumps(jsonable_encoder(content), option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    )
+
+
+def _conditional_json_body(request: Request, body: bytes) -> Response:
+    """
+    Responde com um corpo JSON já serializado, com ETag e 304 quando o cliente já possui o mesmo conteúdo.
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in client_etags or "*" in client_etags:
+            return Response(status_code=304, headers={"ETag": etag})
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def get_database_service(request: Request) -> DatabaseService:
     """Dependency para obter serviço de banco de dados."""
-    from app.main import database_service
-    return database_service
+    return request.app.state.db_service
 
 
-def get_stream_processor():
+def get_stream_processor(request: Request) -> StreamProcessorMCP:
     """Dependency para obter stream processor."""
-    global stream_processor
-    if stream_processor is None:
-        from app.main import database_service
-        stream_processor = StreamProcessorMCP(database_service)
-    return stream_processor
+    return request.app.state.stream_processor
 
 
-def get_file_processor():
+def get_file_processor(request: Request) -> FileProcessorMCP:
     """Dependency para obter file processor."""
-    global file_processor
-    if file_processor is None:
-        from app.main import database_service
-        file_processor = FileProcessorMCP(database_service)
-    return file_processor
+    return request.app.state.file_processor
 
 
-def get_dashboard_service():
+def get_dashboard_service(request: Request) -> DashboardService:
     """Dependency para obter dashboard service."""
-    global dashboard_service
-    if dashboard_service is None:
-        from app.main import database_service
-        dashboard_service = DashboardService(database_service)
-    return dashboard_service
+    return request.app.state.dashboard_service
 
 
-def get_alert_system():
+def get_alert_system(request: Request) -> AlertSystem:
     """Dependency para obter alert system."""
-    global alert_system
-    if alert_system is None:
-        alert_system = AlertSystem()
-    return alert_system
+    return request.app.state.alert_system
 
 
 # ==================== ROTAS DE PROCESSAMENTO DE ARQUIVOS ====================
@@ -74,22 +120,40 @@ async def export_csv(
     """
     Exporta dados dos pokémons para arquivo CSV e retorna o arquivo para download.
     """
-    try:
-        filepath = await file_proc.export_to_csv(filename)
-        file_path = Path(filepath)
+    filepath = await file_proc.export_to_csv(filename)
+    file_path = Path(filepath)
 
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail="Arquivo não encontrado")
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail="Arquivo não encontrado")
 
-        return FileResponse(
-            path=str(file_path),
-            filename=file_path.name,
-            media_type='text/csv',
-            headers={"Content-Disposition": f"attachment; filename={file_path.name}"}
-        )
-    except Exception as e:
-        logger.error(f"Erro na exportação CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return FileResponse(
+        path=str(file_path),
+        filename=file_path.name,
+        media_type='text/csv',
+        headers={"Content-Disposition": f"attachment; filename={file_path.name}"}
+    )
+
+
+@router.post("/file/export-feather")
+async def export_feather(
+    filename: Optional[str] = None,
+    file_proc: FileProcessorMCP = Depends(get_file_processor)
+):
+    """
+    Exporta dados dos pokémons para arquivo Arrow/Feather e retorna o arquivo para download.
+    """
+    filepath = await file_proc.export_to_feather(filename)
+    file_path = Path(filepath)
+
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail="Arquivo não encontrado")
+
+    return FileResponse(
+        path=str(file_path),
+        filename=file_path.name,
+        media_type='application/vnd.apache.arrow.file',
+        headers={"Content-Disposition": f"attachment; filename={file_path.name}"}
+    )
 
 
 @router.post("/file/export-json")
@@ -100,22 +164,18 @@ async def export_json(
     """
     Exporta dados dos pokémons para arquivo JSON e retorna o arquivo para download.
     """
-    try:
-        filepath = await file_proc.export_to_json(filename)
-        file_path = Path(filepath)
+    filepath = await file_proc.export_to_json(filename)
+    file_path = Path(filepath)
 
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail="Arquivo não encontrado")
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail="Arquivo não encontrado")
 
-        return FileResponse(
-            path=str(file_path),
-            filename=file_path.name,
-            media_type='application/json',
-            headers={"Content-Disposition": f"attachment; filename={file_path.name}"}
-        )
-    except Exception as e:
-        logger.error(f"Erro na exportação JSON: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return FileResponse(
+        path=str(file_path),
+        filename=file_path.name,
+        media_type='application/json',
+        headers={"Content-Disposition": f"attachment; filename={file_path.name}"}
+    )
 
 
 @router.post("/file/clean-data")
@@ -126,54 +186,44 @@ async def clean_data(
     """
     Realiza limpeza e normalização dos dados dos pokémons.
     """
-    try:
-        result = await file_proc.clean_and_normalize_data()
-        return {
-            "success": True,
-            "message": "Limpeza de dados concluída",
-            "result": result
-        }
-    except Exception as e:
-        logger.error(f"Erro na limpeza dos dados: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await file_proc.clean_and_normalize_data()
+    return {
+        "success": True,
+        "message": "Limpeza de dados concluída",
+        "result": result
+    }
 
 
 @router.get("/file/aggregations")
 async def get_aggregations(
+    request: Request,
     file_proc: FileProcessorMCP = Depends(get_file_processor)
 ):
     """
     Retorna agregações e estatísticas dos dados dos pokémons.
     """
-    try:
-        aggregations = await file_proc.generate_aggregations()
-        return {
-            "success": True,
-            "aggregations": aggregations
-        }
-    except Exception as e:
-        logger.error(f"Erro ao gerar agregações: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    aggregations = await file_proc.generate_aggregations()
+    return _conditional_json(request, {
+        "success": True,
+        "aggregations": aggregations
+    })
 
 
 @router.post("/file/generate-report")
 async def generate_report(
     report_type: str = Query("summary", description="Tipo de relatório: summary, detailed, types_analysis"),
+    include_members: bool = Query(False, description="Inclui os pokémons de cada tipo no relatório types_analysis"),
     file_proc: FileProcessorMCP = Depends(get_file_processor)
 ):
     """
     Gera relatório automático dos dados dos pokémons.
     """
-    try:
-        filepath = await file_proc.generate_report(report_type)
-        return {
-            "success": True,
-            "message": f"Relatório {report_type} gerado",
-            "filepath": filepath
-        }
-    except Exception as e:
-        logger.error(f"Erro ao gerar relatório: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    filepath = await file_proc.generate_report(report_type, include_members)
+    return {
+        "success": True,
+        "message": f"Relatório {report_type} gerado",
+        "filepath": filepath
+    }
 
 
 @router.post("/file/upload")
@@ -185,26 +235,27 @@ async def upload_file(
     """
     Faz upload e processa arquivo CSV/JSON.
     """
+    # Salvar arquivo temporário em blocos, sem bloquear o event loop
+    fd, tmp_name = tempfile.mkstemp(suffix=Path(file.filename).suffix)
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+
     try:
-        # Salvar arquivo temporário
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp_file:
-            shutil.copyfileobj(file.file, tmp_file)
-            tmp_path = tmp_file.name
-        
+        async with aiofiles.open(tmp_path, 'wb') as tmp_file:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await tmp_file.write(chunk)
+
         # Processar arquivo
-        result = await file_proc.process_file(tmp_path, operation)
-        
+        result = await file_proc.process_file(str(tmp_path), operation)
+    finally:
         # Limpar arquivo temporário
-        Path(tmp_path).unlink()
-        
-        return {
-            "success": True,
-            "message": f"Arquivo processado com operação: {operation}",
-            "result": result
-        }
-    except Exception as e:
-        logger.error(f"Erro no upload/processamento: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        tmp_path.unlink(missing_ok=True)
+    
+    return {
+        "success": True,
+        "message": f"Arquivo processado com operação: {operation}",
+        "result": result
+    }
 
 
 # ==================== ROTAS DE STREAM PROCESSING ====================
@@ -217,23 +268,19 @@ async def start_stream_processing(
     """
     Inicia o processamento em tempo real.
     """
-    try:
-        if stream_proc.is_running:
-            return {
-                "success": False,
-                "message": "Stream processor já está rodando"
-            }
-        
-        # Iniciar em background
-        background_tasks.add_task(stream_proc.start_stream_processing)
-        
+    if stream_proc.is_running:
         return {
-            "success": True,
-            "message": "Stream processor iniciado"
+            "success": False,
+            "message": "Stream processor já está rodando"
         }
-    except Exception as e:
-        logger.error(f"Erro ao iniciar stream processor: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    # Iniciar em background
+    background_tasks.add_task(stream_proc.start_stream_processing)
+    
+    return {
+        "success": True,
+        "message": "Stream processor iniciado"
+    }
 
 
 @router.post("/stream/stop")
@@ -243,15 +290,11 @@ async def stop_stream_processing(
     """
     Para o processamento em tempo real.
     """
-    try:
-        await stream_proc.stop_stream_processing()
-        return {
-            "success": True,
-            "message": "Stream processor parado"
-        }
-    except Exception as e:
-        logger.error(f"Erro ao parar stream processor: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await stream_proc.stop_stream_processing()
+    return {
+        "success": True,
+        "message": "Stream processor parado"
+    }
 
 
 @router.get("/stream/status")
@@ -261,15 +304,12 @@ async def get_stream_status(
     """
     Retorna status do stream processor.
     """
-    try:
-        status = await stream_proc.get_stream_status()
-        return {
-            "success": True,
-            "status": status
-        }
-    except Exception as e:
-        logger.error(f"Erro ao obter status do stream: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Sem ETag: uptime_seconds muda a cada chamada
+    status = await stream_proc.get_stream_status()
+    return {
+        "success": True,
+        "status": status
+    }
 
 
 @router.get("/stream/events")
@@ -280,16 +320,12 @@ async def get_recent_events(
     """
     Retorna eventos recentes do stream processor.
     """
-    try:
-        events = await stream_proc.get_recent_events(limit)
-        return {
-            "success": True,
-            "events": events,
-            "count": len(events)
-        }
-    except Exception as e:
-        logger.error(f"Erro ao obter eventos: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    events = await stream_proc.get_recent_events(limit)
+    return {
+        "success": True,
+        "events": events,
+        "count": len(events)
+    }
 
 
 @router.post("/stream/anomaly-rule")
@@ -301,18 +337,14 @@ async def update_anomaly_rule(
     """
     Atualiza configuração de regra de anomalia.
     """
-    try:
-        success = await stream_proc.update_anomaly_rule(rule_name, enabled)
-        if success:
-            return {
-                "success": True,
-                "message": f"Regra {rule_name} {'habilitada' if enabled else 'desabilitada'}"
-            }
-        else:
-            raise HTTPException(status_code=404, detail=f"Regra {rule_name} não encontrada")
-    except Exception as e:
-        logger.error(f"Erro ao atualizar regra: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = await stream_proc.update_anomaly_rule(rule_name, enabled)
+    if success:
+        return {
+            "success": True,
+            "message": f"Regra {rule_name} {'habilitada' if enabled else 'desabilitada'}"
+        }
+    else:
+        raise HTTPException(status_code=404, detail=f"Regra {rule_name} não encontrada")
 
 
 @router.post("/stream/simulate-anomaly")
@@ -324,52 +356,38 @@ async def simulate_anomaly(
     """
     Simula uma anomalia para testes.
     """
-    try:
-        result = await stream_proc.simulate_anomaly(pokemon_name, anomaly_type)
-        return {
-            "success": "error" not in result,
-            "result": result
-        }
-    except Exception as e:
-        logger.error(f"Erro ao simular anomalia: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await stream_proc.simulate_anomaly(pokemon_name, anomaly_type)
+    return {
+        "success": "error" not in result,
+        "result": result
+    }
 
 
 # ==================== ROTAS DE DASHBOARD ====================
 
 @router.get("/dashboard/data")
 async def get_dashboard_data(
+    request: Request,
     refresh_cache: bool = Query(False, description="Forçar atualização do cache"),
     dashboard_svc: DashboardService = Depends(get_dashboard_service)
 ):
     """
     Retorna dados completos para o dashboard principal.
     """
-    try:
-        data = await dashboard_svc.get_dashboard_data(refresh_cache)
-        return {
-            "success": True,
-            "dashboard": data
-        }
-    except Exception as e:
-        logger.error(f"Erro ao obter dados do dashboard: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Os dados do dashboard já vêm serializados do cache do serviço
+    data = await dashboard_svc.get_dashboard_json(refresh_cache)
+    return _conditional_json_body(request, b'{"success":true,"dashboard":' + data + b'}')
 
 
-@router.get("/dashboard/html", response_class=HTMLResponse)
+@router.get("/dashboard/html", response_class=FileResponse)
 async def get_dashboard_html(
     dashboard_svc: DashboardService = Depends(get_dashboard_service)
 ):
     """
     Retorna dashboard em formato HTML para visualização.
     """
-    try:
-        html_file = await dashboard_svc.get_dashboard_html()
-        with open(html_file, 'r', encoding='utf-8') as f:
-            return f.read()
-    except Exception as e:
-        logger.error(f"Erro ao gerar dashboard HTML: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    html_file = await dashboard_svc.get_dashboard_html()
+    return FileResponse(path=html_file, media_type="text/html")
 
 
 @router.post("/dashboard/report")
@@ -380,16 +398,12 @@ async def generate_scheduled_report(
     """
     Gera relatório programado.
     """
-    try:
-        filepath = await dashboard_svc.generate_scheduled_report(report_type)
-        return {
-            "success": True,
-            "message": f"Relatório {report_type} gerado",
-            "filepath": filepath
-        }
-    except Exception as e:
-        logger.error(f"Erro ao gerar relatório programado: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    filepath = await dashboard_svc.generate_scheduled_report(report_type)
+    return {
+        "success": True,
+        "message": f"Relatório {report_type} gerado",
+        "filepath": filepath
+    }
 
 
 @router.post("/dashboard/clear-cache")
@@ -399,15 +413,11 @@ async def clear_dashboard_cache(
     """
     Limpa cache do dashboard.
     """
-    try:
-        await dashboard_svc.clear_cache()
-        return {
-            "success": True,
-            "message": "Cache do dashboard limpo"
-        }
-    except Exception as e:
-        logger.error(f"Erro ao limpar cache: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    dashboard_svc.clear_cache()
+    return {
+        "success": True,
+        "message": "Cache do dashboard limpo"
+    }
 
 
 # ==================== ROTAS DE ALERTAS ====================
@@ -423,19 +433,16 @@ async def send_alert(
     """
     Envia um alerta manual.
     """
-    try:
-        success = await alert_sys.send_alert(level, title, message, details)
-        return {
-            "success": success,
-            "message": "Alerta enviado" if success else "Falha ao enviar alerta"
-        }
-    except Exception as e:
-        logger.error(f"Erro ao enviar alerta: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = await alert_sys.send_alert(level, title, message, details)
+    return {
+        "success": success,
+        "message": "Alerta enviado" if success else "Falha ao enviar alerta"
+    }
 
 
 @router.get("/alerts/history")
 async def get_alert_history(
+    request: Request,
     limit: int = Query(50, description="Número de alertas"),
     level: Optional[str] = Query(None, description="Filtrar por nível"),
     alert_sys: AlertSystem = Depends(get_alert_system)
@@ -443,40 +450,33 @@ async def get_alert_history(
     """
     Retorna histórico de alertas.
     """
-    try:
-        since = None
-        if level:
-            # Se especificou nível, buscar últimas 24h
-            from datetime import datetime, timedelta
-            since = datetime.utcnow() - timedelta(hours=24)
+    since = None
+    if level:
+        # Se especificou nível, buscar últimas 24h
+        from datetime import UTC, datetime, timedelta
+        since = datetime.now(UTC) - timedelta(hours=24)
 
-        history = await alert_sys.get_alert_history(limit, level, since)
-        return {
-            "success": True,
-            "alerts": history,
-            "count": len(history)
-        }
-    except Exception as e:
-        logger.error(f"Erro ao obter histórico de alertas: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    history = await alert_sys.get_alert_history(limit, level, since)
+    return _conditional_json(request, {
+        "success": True,
+        "alerts": history,
+        "count": len(history)
+    })
 
 
 @router.get("/alerts/metrics")
 async def get_alert_metrics(
+    request: Request,
     alert_sys: AlertSystem = Depends(get_alert_system)
 ):
     """
     Retorna métricas do sistema de alertas.
     """
-    try:
-        metrics = await alert_sys.get_alert_metrics()
-        return {
-            "success": True,
-            "metrics": metrics
-        }
-    except Exception as e:
-        logger.error(f"Erro ao obter métricas de alertas: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    metrics = await alert_sys.get_alert_metrics()
+    return _conditional_json(request, {
+        "success": True,
+        "metrics": metrics
+    })
 
 
 @router.post("/alerts/configure-channel")
@@ -488,18 +488,14 @@ async def configure_alert_channel(
     """
     Configura canal de alerta.
     """
-    try:
-        success = await alert_sys.configure_channel(channel, enabled)
-        if success:
-            return {
-                "success": True,
-                "message": f"Canal {channel} {'habilitado' if enabled else 'desabilitado'}"
-            }
-        else:
-            raise HTTPException(status_code=400, detail=f"Canal inválido: {channel}")
-    except Exception as e:
-        logger.error(f"Erro ao configurar canal: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = await alert_sys.configure_channel(channel, enabled)
+    if success:
+        return {
+            "success": True,
+            "message": f"Canal {channel} {'habilitado' if enabled else 'desabilitado'}"
+        }
+    else:
+        raise HTTPException(status_code=400, detail=f"Canal inválido: {channel}")
 
 
 @router.post("/alerts/configure-rule")
@@ -511,18 +507,14 @@ async def configure_alert_rule(
     """
     Configura regra de alerta.
     """
-    try:
-        success = await alert_sys.configure_rule(rule_name, config)
-        if success:
-            return {
-                "success": True,
-                "message": f"Regra {rule_name} atualizada"
-            }
-        else:
-            raise HTTPException(status_code=404, detail=f"Regra inválida: {rule_name}")
-    except Exception as e:
-        logger.error(f"Erro ao configurar regra: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = await alert_sys.configure_rule(rule_name, config)
+    if success:
+        return {
+            "success": True,
+            "message": f"Regra {rule_name} atualizada"
+        }
+    else:
+        raise HTTPException(status_code=404, detail=f"Regra inválida: {rule_name}")
 
 
 @router.post("/alerts/test")
@@ -533,15 +525,11 @@ async def test_alert(
     """
     Envia alerta de teste.
     """
-    try:
-        result = await alert_sys.test_alert(level)
-        return {
-            "success": result["success"],
-            "result": result
-        }
-    except Exception as e:
-        logger.error(f"Erro no teste de alerta: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await alert_sys.test_alert(level)
+    return {
+        "success": result["success"],
+        "result": result
+    }
 
 
 @router.post("/alerts/clear-history")
@@ -551,15 +539,11 @@ async def clear_alert_history(
     """
     Limpa histórico de alertas.
     """
-    try:
-        count = await alert_sys.clear_alert_history()
-        return {
-            "success": True,
-            "message": f"Histórico limpo: {count} alertas removidos"
-        }
-    except Exception as e:
-        logger.error(f"Erro ao limpar histórico: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    count = await alert_sys.clear_alert_history()
+    return {
+        "success": True,
+        "message": f"Histórico limpo: {count} alertas removidos"
+    }
 
 
 @router.post("/alerts/export")
@@ -570,16 +554,12 @@ async def export_alerts(
     """
     Exporta histórico de alertas.
     """
-    try:
-        filepath = await alert_sys.export_alerts(filename)
-        return {
-            "success": True,
-            "message": "Alertas exportados",
-            "filepath": filepath
-        }
-    except Exception as e:
-        logger.error(f"Erro ao exportar alertas: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    filepath = await alert_sys.export_alerts(filename)
+    return {
+        "success": True,
+        "message": "Alertas exportados",
+        "filepath": filepath
+    }
 
 
 # ==================== ROTAS DE DOWNLOAD ====================
@@ -592,31 +572,28 @@ async def download_file(
     """
     Download de arquivos gerados (relatórios, exportações, etc).
     """
-    try:
-        # Mapear tipos de arquivo para diretórios
-        type_dirs = {
-            "exports": "data/exports",
-            "reports": "data/reports",
-            "dashboards": "data/dashboards",
-            "alerts": "data/alerts"
-        }
+    base_dir = DOWNLOAD_DIRS.get(file_type)
+    if base_dir is None:
+        raise HTTPException(status_code=400, detail=f"Tipo de arquivo inválido: {file_type}")
 
-        if file_type not in type_dirs:
-            raise HTTPException(status_code=400, detail=f"Tipo de arquivo inválido: {file_type}")
+    if ".." in filename or "/" in filename or "\\" in filename:
+        raise HTTPException(status_code=400, detail="Nome de arquivo inválido")
 
-        file_path = Path(type_dirs[file_type]) / filename
+    file_path = base_dir / filename
 
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail="Arquivo não encontrado")
+    # Um único stat serve tanto para checar a existência quanto para o
+    # FileResponse, que assim não precisa repeti-lo ao enviar o arquivo
+    try:
+        stat_result = file_path.stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Arquivo não encontrado")
 
-        return FileResponse(
-            path=str(file_path),
-            filename=filename,
-            media_type='application/octet-stream'
-        )
-    except Exception as e:
-        logger.error(f"Erro no download: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return FileResponse(
+        path=file_path,
+        stat_result=stat_result,
+        filename=filename,
+        media_type='application/octet-stream'
+    )
 
 
 # ==================== ROTAS DE STATUS GERAL ====================
@@ -629,22 +606,19 @@ async def get_pipeline_status(
     """
     Retorna status geral da pipeline.
     """
-    try:
-        stream_status = await stream_proc.get_stream_status()
-        alert_metrics = await alert_sys.get_alert_metrics()
-
-        return {
-            "success": True,
-            "pipeline_status": {
-                "stream_processor": stream_status,
-                "alert_system": alert_metrics,
-                "services": {
-                    "file_processor": "available",
-                    "dashboard_service": "available",
-                    "database": "connected"
-                }
+    stream_status = await stream_proc.get_stream_status()
+    alert_metrics = await alert_sys.get_alert_metrics()
+
+    # Sem ETag: o status do stream processor inclui uptime_seconds
+    return {
+        "success": True,
+        "pipeline_status": {
+            "stream_processor": stream_status,
+            "alert_system": alert_metrics,
+            "services": {
+                "file_processor": "available",
+                "dashboard_service": "available",
+                "database": "connected"
             }
         }
-    except Exception as e:
-        logger.error(f"Erro ao obter status da pipeline: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    }
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Request
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 import logging
 
 from app.models.pokemon import Pokemon, PokemonResponse, PokemonListResponse
-from app.services.database import DatabaseService
 from app.services.pokemon_service import PokemonService
 
 logger = logging.getLogger(__name__)
@@ -11,22 +11,31 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-async def get_db_service():
-    from app.main import app
-    return app.state.db_service
+async def get_pokemon_service(request: Request) -> PokemonService:
+    return request.app.state.pokemon_service
 
 
-async def get_pokemon_service(db_service: DatabaseService = Depends(get_db_service)):
-    return PokemonService(db_service)
+async def save_pokemon_in_background(pokemon_service: PokemonService, pokemon_data: dict):
+    """
+    Salva o pokémon importado após o envio da resposta.
+    """
+    try:
+        await pokemon_service.save_pokemon(pokemon_data)
+    except Exception as e:
+        logger.error("Error saving pokemon %s in background: %s", pokemon_data.get("name"), e)
 
 
 @router.get("/import-pokemon", response_model=PokemonResponse)
 async def import_pokemon(
+    background_tasks: BackgroundTasks,
     name: str = Query(..., description="Nome do Pokémon para importar"),
+    sync: bool = Query(False, description="Aguarda a gravação no banco e retorna o documento salvo"),
     pokemon_service: PokemonService = Depends(get_pokemon_service)
 ):
     """
     Busca informações do pokémon via Pokémon MCP e salva no MongoDB via MongoDB MCP.
+    Por padrão a gravação ocorre em segundo plano, após a resposta; use sync=true
+    para aguardá-la.
     """
     try:
         logger.info(f"Importing pokemon: {name}")
@@ -40,6 +49,15 @@ async def import_pokemon(
                 detail=f"Pokémon '{name}' não encontrado"
             )
         
+        if not sync:
+            # Save to MongoDB via MongoDB MCP after the response is sent
+            background_tasks.add_task(save_pokemon_in_background, pokemon_service, pokemon_data)
+            return PokemonResponse(
+                success=True,
+                message=f"Pokémon '{name}' encontrado; gravação em andamento",
+                data=pokemon_data
+            )
+        
         # Save to MongoDB via MongoDB MCP
         saved_pokemon = await pokemon_service.save_pokemon(pokemon_data)
         
@@ -61,24 +79,31 @@ async def import_pokemon(
 
 @router.get("/pokemons", response_model=PokemonListResponse)
 async def list_pokemons(
-    skip: int = Query(0, ge=0, description="Número de registros para pular"),
+    after: Optional[str] = Query(None, description="Cursor: nome do último pokémon da página anterior (next_cursor)"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Número de registros para pular (prefira 'after')"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros para retornar"),
     pokemon_service: PokemonService = Depends(get_pokemon_service)
 ):
     """
-    Lista todos os pokémons registrados no banco.
+    Lista todos os pokémons registrados no banco, ordenados por nome.
+    Para a próxima página, envie o next_cursor da resposta em `after`.
     """
     try:
-        logger.info(f"Listing pokemons with skip={skip}, limit={limit}")
+        logger.info(f"Listing pokemons with after={after}, skip={skip}, limit={limit}")
         
-        pokemons, total = await pokemon_service.list_pokemons(skip=skip, limit=limit)
+        pokemons, total = await pokemon_service.list_pokemons(skip=skip, limit=limit, after=after)
         
-        return PokemonListResponse(
+        response = PokemonListResponse(
             success=True,
             message=f"Encontrados {len(pokemons)} pokémons",
             data=pokemons,
-            total=total
+            total=total,
+            # O total vem de estimated_document_count (metadados da coleção)
+            total_is_estimate=True,
+            next_cursor=pokemons[-1].name if len(pokemons) == limit else None
         )
+        # Serializa a lista uma única vez, sem a revalidação do response_model
+        return ORJSONResponse(content=response.model_dump(mode="json", by_alias=True))
         
     except Exception as e:
         logger.error(f"Error listing pokemons: {str(e)}")
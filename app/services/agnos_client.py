@@ -1,26 +1,116 @@
 import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, Tuple
 import httpx
-import os
+
+from app.config import get_settings
+from app.services.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Marca ausência de entrada no cache (None é um valor válido: pokémon inexistente)
+_MISSING = object()
+
+
+class _UpstreamError(Exception):
+    """Falha ao consultar a origem dos dados do pokémon."""
+
+
+# Pokémon consultado pelo health check do Pokemon MCP
+HEALTH_PROBE_POKEMON = "pikachu"
+
+# Sprites copiados da resposta da PokeAPI
+SPRITE_KEYS = ("front_default", "front_shiny", "back_default", "back_shiny")
+
+
+def _transform_pokeapi_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte a resposta da PokeAPI para o formato usado pela aplicação.
+    O resultado fica no cache do cliente, então a conversão roda uma vez por pokémon.
+    """
+    sprites = data["sprites"]
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "height": data["height"],
+        "weight": data["weight"],
+        "base_experience": data.get("base_experience"),
+        # Cada "type" da PokeAPI já é exatamente {"name", "url"}
+        "types": [type_info["type"] for type_info in data["types"]],
+        "abilities": [
+            {
+                "name": ability_info["ability"]["name"],
+                "url": ability_info["ability"]["url"],
+                "is_hidden": ability_info.get("is_hidden", False)
+            }
+            for ability_info in data["abilities"]
+        ],
+        "stats": {
+            stat["stat"]["name"].replace("-", "_"): stat["base_stat"]
+            for stat in data["stats"]
+        },
+        "sprites": {key: sprites.get(key) for key in SPRITE_KEYS}
+    }
+
 
 class AgnosClient:
     """
     Cliente para interagir com o Agnos e orquestrar comunicação com MCPs.
     """
     
-    def __init__(self):
-        self.pokemon_mcp_url = os.getenv("POKEMON_MCP_URL")
-        self.mongodb_mcp_url = os.getenv("MONGODB_MCP_URL")
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[TTLCache] = None
+    ):
+        settings = get_settings()
+        self.pokemon_mcp_url = settings.pokemon_mcp_url
+        self.mongodb_mcp_url = settings.mongodb_mcp_url
         self.timeout = 30.0
-        
+        # Cliente HTTP compartilhado (criado no lifespan da aplicação)
+        self.client = http_client if http_client is not None else httpx.AsyncClient(timeout=self.timeout)
+        # Cache compartilhado das respostas do Pokémon MCP
+        self.cache = cache if cache is not None else TTLCache(
+            maxsize=settings.pokemon_cache_size,
+            ttl=settings.pokemon_cache_ttl
+        )
+        self.negative_cache_ttl = settings.pokemon_cache_negative_ttl
+        # Último resultado do health check (instante monotônico, resultado)
+        self._health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._health_ttl = settings.health_cache_ttl
+        self._health_lock = asyncio.Lock()
+
     async def call_pokemon_mcp(self, pokemon_name: str) -> Optional[Dict[str, Any]]:
         """
         Chama o Pokémon MCP para buscar informações de um pokémon.
+        Os dados são mantidos em cache; pokémons inexistentes ficam em cache
+        por pouco tempo, e falhas na origem devolvem o último dado conhecido.
+        """
+        key = f"pokemcp:{pokemon_name.lower()}"
+        cached = self.cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        try:
+            pokemon_data = await self._fetch_pokemon(pokemon_name)
+        except _UpstreamError:
+            stale = self.cache.get_stale(key)
+            if stale is not None:
+                logger.warning("Usando dados em cache para %s após falha no Pokemon MCP", pokemon_name)
+            return stale
+
+        if pokemon_data is None:
+            self.cache.set(key, None, ttl=self.negative_cache_ttl)
+        else:
+            self.cache.set(key, pokemon_data)
+        return pokemon_data
+
+    async def _fetch_pokemon(self, pokemon_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca o pokémon na origem. Retorna None quando ele não existe e
+        levanta _UpstreamError quando a origem falha.
         """
         try:
             logger.info(f"Calling Pokemon MCP for: {pokemon_name}")
@@ -30,62 +120,30 @@ class AgnosClient:
             # que orquestraria a comunicação com o MCP
             
             # Por enquanto, vamos usar a PokeAPI diretamente como fallback
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_name}")
+            response = await self.client.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_name}")
+            
+            if response.status_code == 200:
+                # Transformar dados da PokeAPI para nosso formato
+                pokemon_data = _transform_pokeapi_data(response.json())
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Transformar dados da PokeAPI para nosso formato
-                    pokemon_data = {
-                        "id": data["id"],
-                        "name": data["name"],
-                        "height": data["height"],
-                        "weight": data["weight"],
-                        "base_experience": data.get("base_experience"),
-                        "types": [
-                            {
-                                "name": type_info["type"]["name"],
-                                "url": type_info["type"]["url"]
-                            }
-                            for type_info in data["types"]
-                        ],
-                        "abilities": [
-                            {
-                                "name": ability_info["ability"]["name"],
-                                "url": ability_info["ability"]["url"],
-                                "is_hidden": ability_info.get("is_hidden", False)
-                            }
-                            for ability_info in data["abilities"]
-                        ],
-                        "stats": {
-                            stat["stat"]["name"].replace("-", "_"): stat["base_stat"]
-                            for stat in data["stats"]
-                        },
-                        "sprites": {
-                            "front_default": data["sprites"].get("front_default"),
-                            "front_shiny": data["sprites"].get("front_shiny"),
-                            "back_default": data["sprites"].get("back_default"),
-                            "back_shiny": data["sprites"].get("back_shiny")
-                        }
-                    }
-                    
-                    logger.info(f"Successfully fetched pokemon data for: {pokemon_name}")
-                    return pokemon_data
-                    
-                elif response.status_code == 404:
-                    logger.warning(f"Pokemon not found: {pokemon_name}")
-                    return None
-                else:
-                    logger.error(f"Error fetching pokemon {pokemon_name}: {response.status_code}")
-                    return None
-                    
+                logger.info(f"Successfully fetched pokemon data for: {pokemon_name}")
+                return pokemon_data
+                
+            elif response.status_code == 404:
+                logger.warning(f"Pokemon not found: {pokemon_name}")
+                return None
+            else:
+                logger.error(f"Error fetching pokemon {pokemon_name}: {response.status_code}")
+                raise _UpstreamError()
+                
+        except _UpstreamError:
+            raise
         except httpx.TimeoutException:
             logger.error(f"Timeout fetching pokemon: {pokemon_name}")
-            return None
+            raise _UpstreamError()
         except Exception as e:
             logger.error(f"Error calling Pokemon MCP for {pokemon_name}: {str(e)}")
-            return None
+            raise _UpstreamError()
     
     async def call_mongodb_mcp(self, operation: str, collection: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -121,35 +179,57 @@ class AgnosClient:
     async def health_check(self) -> Dict[str, Any]:
         """
         Verifica a saúde da conexão com os MCPs.
+        O resultado fica em cache por alguns segundos, e verificações
+        concorrentes aguardam uma única consulta aos MCPs.
         """
-        try:
-            # Verificar conectividade com os MCPs
-            pokemon_status = "unknown"
-            mongodb_status = "unknown"
-            
-            # Teste simples para Pokemon MCP
-            try:
-                test_result = await self.call_pokemon_mcp("pikachu")
-                pokemon_status = "healthy" if test_result else "unhealthy"
-            except:
-                pokemon_status = "unhealthy"
-            
-            # Teste simples para MongoDB MCP
-            try:
-                test_result = await self.call_mongodb_mcp("ping", "test", {})
-                mongodb_status = "healthy" if test_result.get("success") else "unhealthy"
-            except:
-                mongodb_status = "unhealthy"
-            
-            return {
-                "agnos_status": "connected",
-                "pokemon_mcp": pokemon_status,
-                "mongodb_mcp": mongodb_status
-            }
+        cached = self._cached_health()
+        if cached is not None:
+            return cached
+        
+        async with self._health_lock:
+            cached = self._cached_health()
+            if cached is not None:
+                return cached
             
-        except Exception as e:
-            logger.error(f"Error in health check: {str(e)}")
-            return {
-                "agnos_status": "error",
-                "error": str(e)
-            }
+            result = await self._check_health()
+            self._health_cache = (time.monotonic(), result)
+            return result
+    
+    def _cached_health(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o último health check se ainda estiver dentro do TTL.
+        """
+        if self._health_cache is None:
+            return None
+        checked_at, result = self._health_cache
+        if time.monotonic() - checked_at >= self._health_ttl:
+            return None
+        return result
+    
+    async def _check_health(self) -> Dict[str, Any]:
+        """
+        Consulta os MCPs para montar o health check.
+        """
+        # Testes simples dos MCPs, executados em paralelo; falhas voltam
+        # como resultado, sem propagar exceções. O Pokémon MCP é consultado
+        # direto na origem: o cache e o fallback para dados antigos
+        # mascarariam uma origem fora do ar
+        pokemon_result, mongodb_result = await asyncio.gather(
+            self._fetch_pokemon(HEALTH_PROBE_POKEMON),
+            self.call_mongodb_mcp("ping", "test", {}),
+            return_exceptions=True
+        )
+        
+        for result in (pokemon_result, mongodb_result):
+            # Cancelamentos e interrupções não indicam falha do MCP
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+        
+        pokemon_ok = not isinstance(pokemon_result, Exception) and bool(pokemon_result)
+        mongodb_ok = not isinstance(mongodb_result, Exception) and bool(mongodb_result.get("success"))
+        
+        return {
+            "agnos_status": "connected",
+            "pokemon_mcp": "healthy" if pokemon_ok else "unhealthy",
+            "mongodb_mcp": "healthy" if mongodb_ok else "unhealthy"
+        }
@@ -1,9 +1,11 @@
 import asyncio
+import itertools
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import UTC, datetime, timedelta
 from collections import deque
-import json
+import orjson
 from pathlib import Path
 from enum import Enum
 
@@ -23,6 +25,18 @@ class AlertChannel(str, Enum):
     WEBHOOK = "webhook"  # Para implementação futura
 
 
+# Máximo de linhas e espera máxima (segundos) por lote gravado no JSONL
+WRITE_BATCH_SIZE = 256
+WRITE_BATCH_DELAY = 0.1
+
+
+def _public_alert(alert: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cópia do alerta sem os campos internos (prefixo "_").
+    """
+    return {key: value for key, value in alert.items() if not key.startswith('_')}
+
+
 class AlertSystem:
     """
     Sistema de alertas para anomalias detectadas no processamento de dados.
@@ -33,6 +47,18 @@ class AlertSystem:
         self.alerts_dir.mkdir(parents=True, exist_ok=True)
         
         self.alert_history = deque(maxlen=1000)
+        # Sequência que torna os IDs únicos dentro do mesmo milissegundo
+        self._id_counter = itertools.count()
+        # Último envio de cada (título, nível), usado na supressão de duplicatas
+        self._last_seen: Dict[Tuple[str, AlertLevel], datetime] = {}
+        # Instantes (time.monotonic) dos envios recentes, para o rate limit
+        self._rate_window: deque = deque()
+        # Arquivo JSONL do dia, mantido aberto entre alertas
+        self._alert_fh = None
+        self._alert_fh_date: Optional[str] = None
+        # Fila de linhas (data, JSONL) gravadas em lote por _writer_loop
+        self._write_queue: "asyncio.Queue[Optional[Tuple[str, bytes]]]" = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
         self.alert_channels = {
             AlertChannel.LOG: True,
             AlertChannel.FILE: True,
@@ -75,10 +101,13 @@ class AlertSystem:
         """
         try:
             alert_level = AlertLevel(level)
+            now = datetime.now(UTC)
             
             alert = {
                 'id': self._generate_alert_id(),
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': now.isoformat(),
+                # Instante já convertido, para evitar fromisoformat nas consultas
+                '_ts': now,
                 'level': alert_level,
                 'title': title,
                 'message': message,
@@ -87,7 +116,7 @@ class AlertSystem:
             }
             
             # Verificar regras de supressão
-            if self._should_suppress_alert(alert):
+            if self._should_suppress_alert(alert, now):
                 self.metrics['suppressed_alerts'] += 1
                 logger.debug(f"Alerta suprimido: {title}")
                 return False
@@ -103,6 +132,8 @@ class AlertSystem:
             
             if success:
                 self.alert_history.append(alert)
+                self._remember_alert(alert, now)
+                self._rate_window.append(time.monotonic())
                 self.metrics['total_alerts'] += 1
                 self.metrics['alerts_by_level'][alert_level] += 1
                 logger.info(f"Alerta enviado: {title} [{alert_level}]")
@@ -117,10 +148,9 @@ class AlertSystem:
         """
         Gera ID único para o alerta.
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
-        return f"alert_{timestamp}"
+        return f"alert_{int(time.time() * 1000):x}_{next(self._id_counter):04x}"
     
-    def _should_suppress_alert(self, alert: Dict[str, Any]) -> bool:
+    def _should_suppress_alert(self, alert: Dict[str, Any], now: datetime) -> bool:
         """
         Verifica se o alerta deve ser suprimido (duplicata recente).
         """
@@ -128,17 +158,31 @@ class AlertSystem:
             return False
         
         window_minutes = self.alert_rules['duplicate_suppression']['window_minutes']
-        cutoff_time = datetime.utcnow() - timedelta(minutes=window_minutes)
+        cutoff_time = now - timedelta(minutes=window_minutes)
         
-        # Verificar alertas similares recentes
-        for recent_alert in self.alert_history:
-            alert_time = datetime.fromisoformat(recent_alert['timestamp'])
-            if alert_time >= cutoff_time:
-                if (recent_alert['title'] == alert['title'] and 
-                    recent_alert['level'] == alert['level']):
-                    return True
+        key = (alert['title'], alert['level'])
+        last_seen = self._last_seen.get(key)
+        if last_seen is None:
+            return False
+        if last_seen < cutoff_time:
+            del self._last_seen[key]
+            return False
+        return True
+    
+    def _remember_alert(self, alert: Dict[str, Any], now: datetime):
+        """
+        Registra o envio do alerta no índice de duplicatas, descartando
+        entradas fora da janela quando o índice cresce demais.
+        """
+        self._last_seen[(alert['title'], alert['level'])] = now
         
-        return False
+        if len(self._last_seen) > self.alert_history.maxlen:
+            window_minutes = self.alert_rules['duplicate_suppression']['window_minutes']
+            cutoff_time = now - timedelta(minutes=window_minutes)
+            self._last_seen = {
+                key: seen for key, seen in self._last_seen.items()
+                if seen >= cutoff_time
+            }
     
     def _is_rate_limited(self) -> bool:
         """
@@ -149,15 +193,13 @@ class AlertSystem:
         
         max_alerts = self.alert_rules['rate_limit']['max_alerts_per_minute']
         window_minutes = self.alert_rules['rate_limit']['window_minutes']
-        cutoff_time = datetime.utcnow() - timedelta(minutes=window_minutes)
+        cutoff = time.monotonic() - window_minutes * 60
         
-        # Contar alertas recentes
-        recent_count = sum(
-            1 for alert in self.alert_history
-            if datetime.fromisoformat(alert['timestamp']) >= cutoff_time
-        )
+        # Descartar envios que saíram da janela; o restante é a contagem recente
+        while self._rate_window and self._rate_window[0] < cutoff:
+            self._rate_window.popleft()
         
-        return recent_count >= max_alerts
+        return len(self._rate_window) >= max_alerts
     
     async def _send_through_channels(self, alert: Dict[str, Any]) -> bool:
         """
@@ -206,19 +248,75 @@ class AlertSystem:
     async def _send_to_file(self, alert: Dict[str, Any]):
         """
         Salva alerta em arquivo.
+        A linha é enfileirada e gravada em lote pela tarefa de escrita.
         """
         try:
-            # Arquivo diário de alertas
-            date_str = datetime.utcnow().strftime("%Y%m%d")
-            alert_file = self.alerts_dir / f"alerts_{date_str}.jsonl"
+            if self._writer_task is None:
+                self._writer_task = asyncio.create_task(self._writer_loop())
             
-            # Adicionar ao arquivo (formato JSONL)
-            with open(alert_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(alert, ensure_ascii=False) + '\n')
+            # Arquivo diário de alertas (formato JSONL)
+            date_str = alert['_ts'].strftime("%Y%m%d")
+            line = orjson.dumps(_public_alert(alert)) + b'\n'
+            self._write_queue.put_nowait((date_str, line))
                 
         except Exception as e:
             logger.error(f"Erro ao salvar alerta em arquivo: {str(e)}")
     
+    async def _writer_loop(self):
+        """
+        Agrupa as linhas enfileiradas e as grava fora do event loop, até
+        WRITE_BATCH_SIZE linhas ou WRITE_BATCH_DELAY segundos por lote.
+        Termina ao receber None, após gravar o lote em andamento.
+        """
+        loop = asyncio.get_running_loop()
+        running = True
+        while running:
+            item = await self._write_queue.get()
+            if item is None:
+                break
+            
+            batch = [item]
+            deadline = loop.time() + WRITE_BATCH_DELAY
+            while len(batch) < WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._write_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                logger.error(f"Erro ao salvar alertas em arquivo: {str(e)}")
+    
+    def _write_batch(self, batch: List[Tuple[str, bytes]]):
+        """
+        Grava um lote de linhas, trocando de arquivo quando o dia muda.
+        """
+        start = 0
+        while start < len(batch):
+            date_str = batch[start][0]
+            end = start
+            while end < len(batch) and batch[end][0] == date_str:
+                end += 1
+            
+            if date_str != self._alert_fh_date:
+                self._close_file()
+                alert_file = self.alerts_dir / f"alerts_{date_str}.jsonl"
+                self._alert_fh = open(alert_file, 'ab', buffering=64 * 1024)
+                self._alert_fh_date = date_str
+            
+            self._alert_fh.write(b''.join(line for _, line in batch[start:end]))
+            start = end
+        
+        self._alert_fh.flush()
+    
     async def get_alert_history(
         self, 
         limit: int = 50, 
@@ -228,37 +326,48 @@ class AlertSystem:
         """
         Retorna histórico de alertas.
         """
-        alerts = list(self.alert_history)
-        
-        # Filtrar por nível se especificado
-        if level:
-            alerts = [a for a in alerts if a['level'] == level]
-        
-        # Filtrar por data se especificado
-        if since:
-            alerts = [
-                a for a in alerts 
-                if datetime.fromisoformat(a['timestamp']) >= since
-            ]
+        return [_public_alert(alert) for alert in self._recent_alerts(limit, level, since)]
+    
+    def _recent_alerts(
+        self,
+        limit: int,
+        level: Optional[str] = None,
+        since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Seleciona alertas do histórico, dos mais recentes para os mais antigos.
+        """
+        alerts = []
+        if limit <= 0:
+            return alerts
         
-        # Ordenar por timestamp (mais recentes primeiro)
-        alerts.sort(key=lambda x: x['timestamp'], reverse=True)
+        # O histórico é preenchido em ordem cronológica: percorrê-lo de trás
+        # para frente já entrega os mais recentes primeiro, e a varredura
+        # pode parar no primeiro alerta anterior a `since`
+        for alert in reversed(self.alert_history):
+            if since and alert['_ts'] < since:
+                break
+            if level and alert['level'] != level:
+                continue
+            alerts.append(alert)
+            if len(alerts) >= limit:
+                break
         
-        return alerts[:limit]
+        return alerts
     
     async def get_alert_metrics(self) -> Dict[str, Any]:
         """
         Retorna métricas do sistema de alertas.
         """
         # Calcular métricas adicionais
-        recent_alerts = await self.get_alert_history(
-            limit=1000, 
-            since=datetime.utcnow() - timedelta(hours=24)
+        recent_alerts = self._recent_alerts(
+            limit=self.alert_history.maxlen,
+            since=datetime.now(UTC) - timedelta(hours=24)
         )
         
         hourly_distribution = {}
         for alert in recent_alerts:
-            hour = datetime.fromisoformat(alert['timestamp']).hour
+            hour = alert['_ts'].hour
             hourly_distribution[hour] = hourly_distribution.get(hour, 0) + 1
         
         return {
@@ -302,7 +411,7 @@ class AlertSystem:
         """
         Envia alerta de teste.
         """
-        timestamp = datetime.utcnow().strftime("%H:%M:%S")
+        timestamp = datetime.now(UTC).strftime("%H:%M:%S")
         
         success = await self.send_alert(
             level=level,
@@ -328,6 +437,8 @@ class AlertSystem:
         """
         count = len(self.alert_history)
         self.alert_history.clear()
+        self._last_seen.clear()
+        self._rate_window.clear()
         
         # Reset métricas
         self.metrics = {
@@ -349,20 +460,39 @@ class AlertSystem:
         Exporta histórico de alertas para arquivo.
         """
         if not filename:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
             filename = f"alert_export_{timestamp}.json"
         
         filepath = self.alerts_dir / filename
         
         export_data = {
-            'export_timestamp': datetime.utcnow().isoformat(),
+            'export_timestamp': datetime.now(UTC).isoformat(),
             'total_alerts': len(self.alert_history),
             'metrics': self.metrics.copy(),
-            'alerts': list(self.alert_history)
+            'alerts': [_public_alert(alert) for alert in self.alert_history]
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(export_data, option=orjson.OPT_NON_STR_KEYS))
         
         logger.info(f"Alertas exportados para: {filepath}")
         return str(filepath)
+    
+    async def close(self):
+        """
+        Grava os alertas ainda na fila e fecha o arquivo de alertas do dia.
+        """
+        if self._writer_task is not None:
+            self._write_queue.put_nowait(None)
+            await self._writer_task
+            self._writer_task = None
+        self._close_file()
+    
+    def _close_file(self):
+        """
+        Fecha o arquivo JSONL aberto, se houver.
+        """
+        if self._alert_fh is not None:
+            self._alert_fh.close()
+            self._alert_fh = None
+            self._alert_fh_date = None
@@ -0,0 +1,53 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Cache em memória com expiração por entrada e limite de tamanho (LRU).
+    Entradas expiradas continuam disponíveis via get_stale() até serem
+    removidas pelo limite de tamanho, permitindo responder com o último
+    valor conhecido quando a origem falha.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 86400.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retorna o valor ainda válido para a chave, ou default.
+        """
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return default
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retorna o último valor armazenado para a chave, mesmo que expirado.
+        """
+        entry = self._data.get(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Armazena o valor com o TTL informado (ou o padrão do cache).
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove todas as entradas.
+        """
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,11 +1,18 @@
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-import json
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import UTC, date, datetime, time, timedelta
 from pathlib import Path
 import base64
-from collections import Counter
+import hashlib
+import heapq
+from collections import Counter, OrderedDict
+from operator import attrgetter, itemgetter
+
+import aiofiles
+import numpy as np
+import orjson
+from jinja2 import Environment, FileSystemLoader
 
 from app.services.database import DatabaseService
 from app.services.file_processor import FileProcessorMCP
@@ -14,6 +21,117 @@ from app.services.alert_system import AlertSystem
 
 logger = logging.getLogger(__name__)
 
+# Faixas de ID de cada geração (rótulo, último ID)
+GENERATION_BUCKETS = [
+    ("Gen 1 (1-151)", 151),
+    ("Gen 2 (152-251)", 251),
+    ("Gen 3 (252-386)", 386),
+    ("Gen 4 (387-493)", 493),
+    ("Gen 5 (494-649)", 649),
+]
+# Limites inferiores das faixas, no formato do $bucket do MongoDB
+GENERATION_BOUNDARIES = [1] + [upper + 1 for _, upper in GENERATION_BUCKETS]
+GENERATION_LABELS = [label for label, _ in GENERATION_BUCKETS] + ["Outros"]
+
+# Stats base, na ordem das colunas de _stats_matrix
+STAT_FIELDS = ('hp', 'attack', 'defense', 'special_attack', 'special_defense', 'speed')
+
+
+def _stats_matrix(pokemons: List) -> np.ndarray:
+    """
+    Monta uma matriz (N, 6) de inteiros com os stats base dos pokémons.
+    """
+    return np.array(
+        [
+            (s.hp, s.attack, s.defense, s.special_attack, s.special_defense, s.speed)
+            for s in (p.stats for p in pokemons)
+        ],
+        dtype=np.int64
+    ).reshape(-1, len(STAT_FIELDS))
+
+
+# Templates HTML do dashboard (app/templates), com escape automático
+TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(Path(__file__).resolve().parent.parent / "templates"),
+    autoescape=True
+)
+
+# Recomendações de qualidade: (métrica, limite, mensagem); a mensagem entra
+# quando a métrica passa do limite
+QUALITY_RULES = (
+    ('missing_experience_rate', 0.1, "Considere buscar dados de experiência base para pokémons sem essa informação"),
+    ('missing_types_rate', 0.05, "Verifique pokémons sem tipos definidos - isso pode indicar erro na importação"),
+    ('negative_stats', 0, "Corrija stats negativos encontrados nos dados"),
+    ('duplicates', 0, "Remova ou consolide pokémons duplicados"),
+)
+QUALITY_OK_MESSAGE = "Qualidade dos dados está boa! Continue monitorando."
+
+# Quantidade de arquivos HTML do dashboard lembrados por hash dos dados
+HTML_CACHE_SIZE = 32
+
+# Quantidade de pokémons em cada ranking de top_rankings
+RANKING_SIZE = 10
+
+# Rankings exibidos no HTML do dashboard e quantos pokémons de cada um
+HTML_RANKINGS = ('top_attack', 'top_defense', 'top_speed')
+HTML_RANKING_SIZE = 5
+
+# Quantidade de pokémons listados em cada seção de atividade recente
+RECENT_ACTIVITY_LIMIT = 10
+
+
+def _push_bounded(heap: List, entry: Tuple, size: int):
+    """
+    Insere entry no heap mínimo mantendo apenas as `size` maiores entradas.
+    """
+    if len(heap) < size:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+
+
+def _pokemon_projection(pokemon, projections: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Retorna {'name', 'id', 'types'} do pokémon, calculado uma única vez
+    por geração do dashboard (projections é compartilhado entre as seções).
+    """
+    key = id(pokemon)
+    projection = projections.get(key)
+    if projection is None:
+        projection = projections[key] = {
+            'name': pokemon.name,
+            'id': pokemon.id,
+            'types': list(pokemon.type_names)
+        }
+    return projection
+
+
+async def _write_report_json(
+    filepath: Path,
+    report_data: Dict[str, Any],
+    serialized_sections: Optional[Dict[str, bytes]] = None
+):
+    """
+    Grava o relatório em JSON seção por seção, sem montar o documento
+    serializado inteiro em memória e sem bloquear o event loop na escrita.
+    Seções presentes em serialized_sections são gravadas com os bytes já
+    prontos, sem nova serialização.
+    """
+    serialized_sections = serialized_sections or {}
+    async with aiofiles.open(filepath, 'wb') as f:
+        await f.write(b"{")
+        for index, (key, value) in enumerate(report_data.items()):
+            section = serialized_sections.get(key)
+            if section is None:
+                section = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+            await f.write(b"".join((
+                b"\n" if index == 0 else b",\n",
+                orjson.dumps(key),
+                b": ",
+                section
+            )))
+        await f.write(b"\n}\n")
+
 
 class DashboardService:
     """
@@ -25,11 +143,20 @@ class DashboardService:
         self.file_processor = FileProcessorMCP(db_service)
         self.reports_dir = Path("data/dashboards")
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        # Template do dashboard HTML, compilado uma única vez
+        self._html_template = TEMPLATE_ENV.get_template("dashboard.html")
         
-        # Cache para dados do dashboard
+        # Cache para dados do dashboard, invalidado a cada escrita no banco;
+        # a idade máxima é só uma salvaguarda
         self.cache = {}
-        self.cache_ttl = 300  # 5 minutos
+        self.cache_max_age = 3600  # 1 hora
         self.last_cache_update = {}
+        # Incrementado a cada invalidação, para descartar resultados
+        # calculados enquanto uma escrita acontecia
+        self._cache_generation = 0
+        db_service.add_invalidator(self._invalidate_cache)
+        # Arquivos HTML já gerados, pelo hash dos dados do dashboard (LRU)
+        self._html_cache: "OrderedDict[str, str]" = OrderedDict()
     
     async def get_dashboard_data(self, refresh_cache: bool = False) -> Dict[str, Any]:
         """
@@ -44,27 +171,42 @@ class DashboardService:
                 return self.cache[cache_key]
             
             logger.info("Gerando dados do dashboard")
+            generation = self._cache_generation
             
             # Buscar dados básicos
-            pokemons, total = await self.db_service.list_pokemons(skip=0, limit=10000)
+            pokemons, _ = await self.db_service.list_pokemons(skip=0, limit=10000)
             
             if not pokemons:
                 return {"error": "Nenhum pokémon encontrado"}
             
-            # Gerar estatísticas
+            # Gerar estatísticas; o resumo é agregado no banco e roda em
+            # paralelo com as seções calculadas sobre a lista carregada
+            # Projeções (nome, id, tipos) compartilhadas entre rankings e atividade recente
+            projections = {}
+            summary, type_analysis, stats_analysis, top_rankings, recent_activity, data_quality = await asyncio.gather(
+                self._generate_summary_stats(),
+                self._generate_type_analysis(pokemons),
+                self._generate_stats_analysis(pokemons),
+                self._generate_top_rankings(pokemons, projections),
+                self._generate_recent_activity(pokemons, projections),
+                self._generate_data_quality_metrics(pokemons)
+            )
             dashboard_data = {
-                "summary": await self._generate_summary_stats(pokemons, total),
-                "type_analysis": await self._generate_type_analysis(pokemons),
-                "stats_analysis": await self._generate_stats_analysis(pokemons),
-                "top_rankings": await self._generate_top_rankings(pokemons),
-                "recent_activity": await self._generate_recent_activity(pokemons),
-                "data_quality": await self._generate_data_quality_metrics(pokemons),
-                "generated_at": datetime.utcnow().isoformat()
+                "summary": summary,
+                "type_analysis": type_analysis,
+                "stats_analysis": stats_analysis,
+                "top_rankings": top_rankings,
+                "recent_activity": recent_activity,
+                "data_quality": data_quality,
+                "generated_at": datetime.now(UTC).isoformat()
             }
             
-            # Atualizar cache
-            self.cache[cache_key] = dashboard_data
-            self.last_cache_update[cache_key] = datetime.utcnow()
+            # Atualizar cache (o dict e sua versão serializada), a menos que
+            # o banco tenha mudado durante o cálculo
+            if generation == self._cache_generation:
+                self.cache[cache_key] = dashboard_data
+                self.cache[f"{cache_key}:json"] = orjson.dumps(dashboard_data)
+                self.last_cache_update[cache_key] = datetime.now(UTC)
             
             return dashboard_data
             
@@ -72,6 +214,23 @@ class DashboardService:
             logger.error(f"Erro ao gerar dados do dashboard: {str(e)}")
             raise
     
+    async def get_dashboard_json(self, refresh_cache: bool = False) -> bytes:
+        """
+        Retorna os dados do dashboard serializados em JSON, reaproveitando os
+        bytes guardados no cache junto com o dict.
+        """
+        dashboard_data = await self.get_dashboard_data(refresh_cache)
+        return self._serialized_dashboard(dashboard_data)
+    
+    def _serialized_dashboard(self, dashboard_data: Dict[str, Any]) -> bytes:
+        """
+        Retorna os bytes em cache de dashboard_data, serializando apenas se
+        o dict não for o que está no cache.
+        """
+        if self.cache.get("main_dashboard") is dashboard_data:
+            return self.cache["main_dashboard:json"]
+        return orjson.dumps(dashboard_data)
+    
     def _is_cache_valid(self, cache_key: str) -> bool:
         """
         Verifica se o cache ainda é válido.
@@ -79,41 +238,43 @@ class DashboardService:
         if cache_key not in self.cache or cache_key not in self.last_cache_update:
             return False
         
-        cache_age = (datetime.utcnow() - self.last_cache_update[cache_key]).total_seconds()
-        return cache_age < self.cache_ttl
+        cache_age = (datetime.now(UTC) - self.last_cache_update[cache_key]).total_seconds()
+        return cache_age < self.cache_max_age
     
-    async def _generate_summary_stats(self, pokemons: List, total: int) -> Dict[str, Any]:
+    def _invalidate_cache(self):
+        """
+        Descarta os dados em cache; chamado pelo DatabaseService após escritas.
         """
-        Gera estatísticas resumidas.
+        self._cache_generation += 1
+        self.cache.clear()
+        self.last_cache_update.clear()
+        self._html_cache.clear()
+    
+    async def _generate_summary_stats(self) -> Dict[str, Any]:
         """
-        # Contagem por geração (baseado no ID)
+        Gera estatísticas resumidas, agregadas diretamente no banco.
+        Usa a contagem exata da agregação, não o total estimado da listagem,
+        para que a completude dos dados feche com as demais contagens.
+        """
+        aggregates = await self.db_service.get_summary_aggregates(GENERATION_BOUNDARIES)
+        total = aggregates["total_count"]
+        
+        bucket_counts = aggregates["generation_counts"]
         generation_counts = {
-            "Gen 1 (1-151)": len([p for p in pokemons if 1 <= p.id <= 151]),
-            "Gen 2 (152-251)": len([p for p in pokemons if 152 <= p.id <= 251]),
-            "Gen 3 (252-386)": len([p for p in pokemons if 252 <= p.id <= 386]),
-            "Gen 4 (387-493)": len([p for p in pokemons if 387 <= p.id <= 493]),
-            "Gen 5 (494-649)": len([p for p in pokemons if 494 <= p.id <= 649]),
-            "Outros": len([p for p in pokemons if p.id > 649 or p.id < 1])
+            label: bucket_counts.get(lower, 0)
+            for label, lower in zip(GENERATION_LABELS, GENERATION_BOUNDARIES[:-1] + ["other"])
         }
-        
-        # Estatísticas de experiência
-        exp_values = [p.base_experience for p in pokemons if p.base_experience is not None]
-        avg_experience = sum(exp_values) / len(exp_values) if exp_values else 0
-        
-        # Pokémons únicos por tipo
-        unique_types = set()
-        for pokemon in pokemons:
-            for ptype in pokemon.types:
-                unique_types.add(ptype.name)
+        exp_count = aggregates["experience_count"]
+        avg_experience = aggregates["experience_sum"] / exp_count if exp_count else 0
         
         return {
             "total_pokemons": total,
-            "unique_types": len(unique_types),
+            "unique_types": aggregates["unique_types"],
             "generation_distribution": generation_counts,
             "average_base_experience": round(avg_experience, 2),
             "data_completeness": {
-                "with_base_experience": len(exp_values),
-                "without_base_experience": total - len(exp_values)
+                "with_base_experience": exp_count,
+                "without_base_experience": total - exp_count
             }
         }
     
@@ -125,50 +286,59 @@ class DashboardService:
         type_combinations = Counter()
         
         for pokemon in pokemons:
-            # Combinações de tipos
-            type_names = [t.name for t in pokemon.types]
-            type_combo = " / ".join(sorted(type_names))
-            type_combinations[type_combo] += 1
+            # Combinações de tipos, contadas pela tupla em cache; o rótulo
+            # ordenado é montado só uma vez por combinação distinta
+            type_names = pokemon.type_names
+            type_combinations[type_names] += 1
+            
+            # Stats lidos uma única vez por pokémon, na ordem de STAT_FIELDS
+            s = pokemon.stats
+            stat_values = (s.hp, s.attack, s.defense, s.special_attack, s.special_defense, s.speed)
             
             # Estatísticas por tipo individual
-            for ptype in pokemon.types:
-                type_name = ptype.name
+            for type_name in type_names:
                 if type_name not in type_stats:
                     type_stats[type_name] = {
                         'count': 0,
-                        'total_stats': {'hp': 0, 'attack': 0, 'defense': 0, 'special_attack': 0, 'special_defense': 0, 'speed': 0},
+                        'total_stats': [0] * len(STAT_FIELDS),
                         'pokemons': []
                     }
                 
-                type_stats[type_name]['count'] += 1
-                type_stats[type_name]['pokemons'].append({
+                data = type_stats[type_name]
+                data['count'] += 1
+                data['pokemons'].append({
                     'name': pokemon.name,
                     'id': pokemon.id
                 })
                 
                 # Somar stats
-                stats_dict = pokemon.stats.dict()
-                for stat_name, stat_value in stats_dict.items():
-                    if stat_name in type_stats[type_name]['total_stats']:
-                        type_stats[type_name]['total_stats'][stat_name] += stat_value
+                totals = data['total_stats']
+                for i, stat_value in enumerate(stat_values):
+                    totals[i] += stat_value
         
         # Calcular médias
         for type_name, data in type_stats.items():
             count = data['count']
             data['avg_stats'] = {
                 stat: round(total / count, 2)
-                for stat, total in data['total_stats'].items()
+                for stat, total in zip(STAT_FIELDS, data['total_stats'])
             }
             del data['total_stats']  # Remover para economizar espaço
             
             # Manter apenas top 5 pokémons por tipo
             data['pokemons'] = data['pokemons'][:5]
         
+        type_counts = {type_name: data['count'] for type_name, data in type_stats.items()}
+        
+        combination_counts = Counter()
+        for type_names, count in type_combinations.items():
+            combination_counts[" / ".join(sorted(type_names))] += count
+        
         return {
             "type_distribution": dict(Counter(type_stats.keys())),
-            "type_combinations": dict(type_combinations.most_common(10)),
+            "type_combinations": dict(combination_counts.most_common(10)),
             "type_stats": type_stats,
-            "most_common_type": max(type_stats.items(), key=lambda x: x[1]['count'])[0] if type_stats else None,
+            "most_common_type": max(type_counts, key=type_counts.get) if type_counts else None,
             "rarest_types": [name for name, data in type_stats.items() if data['count'] == 1]
         }
     
@@ -176,43 +346,40 @@ class DashboardService:
         """
         Gera análise detalhada das estatísticas.
         """
-        stats_data = {
-            'hp': [p.stats.hp for p in pokemons],
-            'attack': [p.stats.attack for p in pokemons],
-            'defense': [p.stats.defense for p in pokemons],
-            'special_attack': [p.stats.special_attack for p in pokemons],
-            'special_defense': [p.stats.special_defense for p in pokemons],
-            'speed': [p.stats.speed for p in pokemons]
-        }
+        # Matriz (N, 6) com os stats de cada pokémon, na ordem de STAT_FIELDS
+        stats_matrix = _stats_matrix(pokemons)
+        n = len(stats_matrix)
+        
+        sorted_matrix = np.sort(stats_matrix, axis=0)
+        mins = stats_matrix.min(axis=0)
+        maxs = stats_matrix.max(axis=0)
+        means = stats_matrix.mean(axis=0)
+        std_devs = stats_matrix.std(axis=0)
         
         analysis = {}
-        for stat_name, values in stats_data.items():
-            sorted_values = sorted(values)
-            n = len(values)
-            
+        for column, stat_name in enumerate(STAT_FIELDS):
             analysis[stat_name] = {
-                'min': min(values),
-                'max': max(values),
-                'mean': round(sum(values) / n, 2),
-                'median': sorted_values[n // 2],
-                'q1': sorted_values[n // 4],
-                'q3': sorted_values[3 * n // 4],
-                'std_dev': round((sum((x - sum(values)/n) ** 2 for x in values) / n) ** 0.5, 2)
+                'min': int(mins[column]),
+                'max': int(maxs[column]),
+                'mean': round(float(means[column]), 2),
+                'median': int(sorted_matrix[n // 2, column]),
+                'q1': int(sorted_matrix[n // 4, column]),
+                'q3': int(sorted_matrix[3 * n // 4, column]),
+                'std_dev': round(float(std_devs[column]), 2)
             }
         
-        # Calcular total de stats por pokémon
-        total_stats = []
-        for pokemon in pokemons:
-            total = (pokemon.stats.hp + pokemon.stats.attack + pokemon.stats.defense + 
-                    pokemon.stats.special_attack + pokemon.stats.special_defense + pokemon.stats.speed)
-            total_stats.append({'name': pokemon.name, 'total': total, 'id': pokemon.id})
-        
-        total_stats.sort(key=lambda x: x['total'], reverse=True)
+        # Total de stats por pokémon; ordenação estável mantém a ordem dos empates
+        totals = stats_matrix.sum(axis=1)
+        top_indices = np.argsort(-totals, kind="stable")[:20]
+        total_stats = [
+            {'name': pokemons[i].name, 'total': int(totals[i]), 'id': pokemons[i].id}
+            for i in top_indices
+        ]
         
         return {
             'individual_stats': analysis,
-            'total_stats_ranking': total_stats[:20],  # Top 20
-            'stat_correlations': await self._calculate_stat_correlations(pokemons),
+            'total_stats_ranking': total_stats,  # Top 20
+            'stat_correlations': await self._calculate_stat_correlations(stats_matrix),
             'stat_distribution_ranges': {
                 'very_low': {'min': 0, 'max': 30},
                 'low': {'min': 31, 'max': 60},
@@ -222,108 +389,95 @@ class DashboardService:
             }
         }
     
-    async def _calculate_stat_correlations(self, pokemons: List) -> Dict[str, float]:
+    async def _calculate_stat_correlations(self, stats_matrix: np.ndarray) -> Dict[str, float]:
         """
-        Calcula correlações simples entre stats.
+        Calcula correlações simples entre stats a partir da matriz de _stats_matrix.
         """
-        # Correlação simples entre ataque e defesa
-        attack_values = [p.stats.attack for p in pokemons]
-        defense_values = [p.stats.defense for p in pokemons]
-        
-        # Correlação de Pearson simplificada
-        n = len(attack_values)
-        if n == 0:
+        if len(stats_matrix) == 0:
             return {}
         
-        mean_attack = sum(attack_values) / n
-        mean_defense = sum(defense_values) / n
-        
-        numerator = sum((attack_values[i] - mean_attack) * (defense_values[i] - mean_defense) for i in range(n))
-        denominator = (sum((x - mean_attack) ** 2 for x in attack_values) * 
-                      sum((x - mean_defense) ** 2 for x in defense_values)) ** 0.5
+        # Correlação de Pearson entre ataque e defesa
+        attack_values = stats_matrix[:, STAT_FIELDS.index('attack')]
+        defense_values = stats_matrix[:, STAT_FIELDS.index('defense')]
         
-        attack_defense_corr = numerator / denominator if denominator != 0 else 0
+        # Variância zero em algum dos stats deixa a correlação indefinida
+        if attack_values.std() == 0 or defense_values.std() == 0:
+            attack_defense_corr = 0.0
+        else:
+            attack_defense_corr = float(np.corrcoef(attack_values, defense_values)[0, 1])
         
         return {
             'attack_defense': round(attack_defense_corr, 3),
             'note': 'Correlação entre -1 (negativa) e 1 (positiva)'
         }
     
-    async def _generate_top_rankings(self, pokemons: List) -> Dict[str, Any]:
+    async def _generate_top_rankings(
+        self, pokemons: List, projections: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Gera rankings dos melhores pokémons.
         """
+        projections = {} if projections is None else projections
         rankings = {}
         
-        # Top por cada stat
-        stats = ['hp', 'attack', 'defense', 'special_attack', 'special_defense', 'speed']
-        for stat in stats:
-            sorted_pokemons = sorted(pokemons, key=lambda p: getattr(p.stats, stat), reverse=True)
+        # Top por cada stat (nlargest evita ordenar a lista inteira)
+        for stat in STAT_FIELDS:
+            top_pokemons = heapq.nlargest(RANKING_SIZE, pokemons, key=attrgetter(f'stats.{stat}'))
             rankings[f'top_{stat}'] = [
-                {
-                    'name': p.name,
-                    'id': p.id,
-                    'value': getattr(p.stats, stat),
-                    'types': [t.name for t in p.types]
-                }
-                for p in sorted_pokemons[:10]
+                {**_pokemon_projection(p, projections), 'value': getattr(p.stats, stat)}
+                for p in top_pokemons
             ]
         
         # Top por experiência base
-        exp_pokemons = [p for p in pokemons if p.base_experience is not None]
-        exp_sorted = sorted(exp_pokemons, key=lambda p: p.base_experience, reverse=True)
+        exp_pokemons = (p for p in pokemons if p.base_experience is not None)
+        top_experience = heapq.nlargest(RANKING_SIZE, exp_pokemons, key=attrgetter('base_experience'))
         rankings['top_experience'] = [
-            {
-                'name': p.name,
-                'id': p.id,
-                'base_experience': p.base_experience,
-                'types': [t.name for t in p.types]
-            }
-            for p in exp_sorted[:10]
+            {**_pokemon_projection(p, projections), 'base_experience': p.base_experience}
+            for p in top_experience
         ]
         
         return rankings
     
-    async def _generate_recent_activity(self, pokemons: List) -> Dict[str, Any]:
+    async def _generate_recent_activity(
+        self, pokemons: List, projections: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Gera dados de atividade recente.
         """
-        # Pokémons adicionados recentemente (últimas 24h)
-        cutoff_time = datetime.utcnow() - timedelta(hours=24)
-        recent_pokemons = [
-            p for p in pokemons 
-            if p.created_at >= cutoff_time
-        ]
-        
-        # Pokémons atualizados recentemente
-        updated_pokemons = [
-            p for p in pokemons 
-            if p.updated_at >= cutoff_time and p.updated_at != p.created_at
-        ]
+        projections = {} if projections is None else projections
+        # Pokémons adicionados e atualizados nas últimas 24h, em uma única
+        # passada; heaps de tamanho fixo guardam os mais recentes de cada lista
+        cutoff_time = datetime.now(UTC) - timedelta(hours=24)
+        recent_count = 0
+        updated_count = 0
+        recent_heap = []
+        updated_heap = []
+        
+        for index, p in enumerate(pokemons):
+            if p.created_at >= cutoff_time:
+                recent_count += 1
+                # -index desempata pela ordem original da lista
+                _push_bounded(recent_heap, (p.created_at, -index, p), RECENT_ACTIVITY_LIMIT)
+            if p.updated_at >= cutoff_time and p.updated_at != p.created_at:
+                updated_count += 1
+                _push_bounded(updated_heap, (p.updated_at, -index, p), RECENT_ACTIVITY_LIMIT)
+        
+        recent_pokemons = [entry[2] for entry in sorted(recent_heap, reverse=True)]
+        updated_pokemons = [entry[2] for entry in sorted(updated_heap, reverse=True)]
         
         return {
             'recent_additions': {
-                'count': len(recent_pokemons),
+                'count': recent_count,
                 'pokemons': [
-                    {
-                        'name': p.name,
-                        'id': p.id,
-                        'created_at': p.created_at.isoformat(),
-                        'types': [t.name for t in p.types]
-                    }
-                    for p in recent_pokemons[:10]
+                    {**_pokemon_projection(p, projections), 'created_at': p.created_at.isoformat()}
+                    for p in recent_pokemons
                 ]
             },
             'recent_updates': {
-                'count': len(updated_pokemons),
+                'count': updated_count,
                 'pokemons': [
-                    {
-                        'name': p.name,
-                        'id': p.id,
-                        'updated_at': p.updated_at.isoformat(),
-                        'types': [t.name for t in p.types]
-                    }
-                    for p in updated_pokemons[:10]
+                    {**_pokemon_projection(p, projections), 'updated_at': p.updated_at.isoformat()}
+                    for p in updated_pokemons
                 ]
             }
         }
@@ -334,29 +488,29 @@ class DashboardService:
         """
         total = len(pokemons)
         
-        # Verificar completude dos dados
-        missing_experience = len([p for p in pokemons if p.base_experience is None])
-        missing_types = len([p for p in pokemons if not p.types])
-        missing_abilities = len([p for p in pokemons if not p.abilities])
-        
-        # Verificar anomalias
-        negative_stats = 0
-        zero_stats = 0
-        extreme_stats = 0
-        
-        for pokemon in pokemons:
-            stats_dict = pokemon.stats.dict()
-            for stat_value in stats_dict.values():
-                if stat_value < 0:
-                    negative_stats += 1
-                elif stat_value == 0:
-                    zero_stats += 1
-                elif stat_value > 200:
-                    extreme_stats += 1
+        # Verificar completude dos dados e duplicatas (por nome) em uma única passada
+        missing_experience = 0
+        missing_types = 0
+        missing_abilities = 0
+        duplicates = 0
+        seen_names = set()
+        for p in pokemons:
+            if p.base_experience is None:
+                missing_experience += 1
+            if not p.types:
+                missing_types += 1
+            if not p.abilities:
+                missing_abilities += 1
+            if p.name in seen_names:
+                duplicates += 1
+            else:
+                seen_names.add(p.name)
         
-        # Duplicatas (por nome)
-        names = [p.name for p in pokemons]
-        duplicates = len(names) - len(set(names))
+        # Verificar anomalias (contagens vetorizadas sobre a matriz de stats)
+        stats_matrix = _stats_matrix(pokemons)
+        negative_stats = int((stats_matrix < 0).sum())
+        zero_stats = int((stats_matrix == 0).sum())
+        extreme_stats = int((stats_matrix > 200).sum())
         
         quality_score = max(0, 100 - (
             (missing_experience / total * 10) +
@@ -390,31 +544,23 @@ class DashboardService:
         """
         Gera recomendações para melhorar a qualidade dos dados.
         """
-        recommendations = []
-        
-        if missing_exp / total > 0.1:
-            recommendations.append("Considere buscar dados de experiência base para pokémons sem essa informação")
-        
-        if missing_types / total > 0.05:
-            recommendations.append("Verifique pokémons sem tipos definidos - isso pode indicar erro na importação")
-        
-        if negative_stats > 0:
-            recommendations.append("Corrija stats negativos encontrados nos dados")
-        
-        if duplicates > 0:
-            recommendations.append("Remova ou consolide pokémons duplicados")
-        
-        if not recommendations:
-            recommendations.append("Qualidade dos dados está boa! Continue monitorando.")
-        
-        return recommendations
+        metrics = {
+            'missing_experience_rate': missing_exp / total,
+            'missing_types_rate': missing_types / total,
+            'negative_stats': negative_stats,
+            'duplicates': duplicates
+        }
+        return [
+            message for metric, limit, message in QUALITY_RULES
+            if metrics[metric] > limit
+        ] or [QUALITY_OK_MESSAGE]
 
     async def generate_scheduled_report(self, report_type: str = "daily") -> str:
         """
         Gera relatório programado.
         """
         try:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
 
             if report_type == "daily":
                 return await self._generate_daily_report(timestamp)
@@ -429,6 +575,14 @@ class DashboardService:
             logger.error(f"Erro ao gerar relatório programado: {str(e)}")
             raise
 
+    async def _get_additions(self, first_day: date, last_day: date) -> List:
+        """
+        Busca no banco os pokémons criados entre first_day e last_day (inclusive, em UTC).
+        """
+        start = datetime.combine(first_day, time.min, tzinfo=UTC)
+        end = datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=UTC)
+        return await self.db_service.list_pokemons_created_between(start, end)
+
     async def _generate_daily_report(self, timestamp: str) -> str:
         """
         Gera relatório diário.
@@ -436,24 +590,19 @@ class DashboardService:
         dashboard_data = await self.get_dashboard_data(refresh_cache=True)
 
         # Dados específicos do dia
-        today = datetime.utcnow().date()
-        cutoff_time = datetime.combine(today, datetime.min.time())
+        today = datetime.now(UTC).date()
 
-        pokemons, _ = await self.db_service.list_pokemons(skip=0, limit=10000)
-        daily_additions = [
-            p for p in pokemons
-            if p.created_at.date() == today
-        ]
+        daily_additions = await self._get_additions(today, today)
 
         report_data = {
             "report_type": "daily",
             "date": today.isoformat(),
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": datetime.now(UTC).isoformat(),
             "summary": {
                 "total_pokemons": dashboard_data["summary"]["total_pokemons"],
                 "daily_additions": len(daily_additions),
                 "new_pokemons": [
-                    {"name": p.name, "id": p.id, "types": [t.name for t in p.types]}
+                    {"name": p.name, "id": p.id, "types": list(p.type_names)}
                     for p in daily_additions
                 ]
             },
@@ -469,8 +618,7 @@ class DashboardService:
         filename = f"daily_report_{timestamp}.json"
         filepath = self.reports_dir / filename
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        await _write_report_json(filepath, report_data)
 
         logger.info(f"Relatório diário gerado: {filepath}")
         return str(filepath)
@@ -482,30 +630,24 @@ class DashboardService:
         dashboard_data = await self.get_dashboard_data(refresh_cache=True)
 
         # Dados da semana
-        today = datetime.utcnow().date()
+        today = datetime.now(UTC).date()
         week_start = today - timedelta(days=today.weekday())
         week_end = week_start + timedelta(days=6)
 
-        pokemons, _ = await self.db_service.list_pokemons(skip=0, limit=10000)
-        weekly_additions = [
-            p for p in pokemons
-            if week_start <= p.created_at.date() <= week_end
-        ]
+        weekly_additions = await self._get_additions(week_start, week_end)
 
         # Análise de tendências
+        additions_by_day = Counter(p.created_at.date() for p in weekly_additions)
         daily_counts = {}
         for i in range(7):
             day = week_start + timedelta(days=i)
-            daily_counts[day.isoformat()] = len([
-                p for p in weekly_additions
-                if p.created_at.date() == day
-            ])
+            daily_counts[day.isoformat()] = additions_by_day[day]
 
         report_data = {
             "report_type": "weekly",
             "week_start": week_start.isoformat(),
             "week_end": week_end.isoformat(),
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": datetime.now(UTC).isoformat(),
             "summary": {
                 "total_pokemons": dashboard_data["summary"]["total_pokemons"],
                 "weekly_additions": len(weekly_additions),
@@ -513,7 +655,7 @@ class DashboardService:
                 "average_daily_additions": round(len(weekly_additions) / 7, 2)
             },
             "trends": {
-                "most_active_day": max(daily_counts.items(), key=lambda x: x[1])[0] if daily_counts else None,
+                "most_active_day": max(daily_counts.items(), key=itemgetter(1))[0] if daily_counts else None,
                 "type_trends": await self._analyze_type_trends(weekly_additions)
             },
             "full_dashboard": dashboard_data
@@ -522,8 +664,9 @@ class DashboardService:
         filename = f"weekly_report_{timestamp}.json"
         filepath = self.reports_dir / filename
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        await _write_report_json(filepath, report_data, {
+            "full_dashboard": self._serialized_dashboard(dashboard_data)
+        })
 
         logger.info(f"Relatório semanal gerado: {filepath}")
         return str(filepath)
@@ -535,34 +678,30 @@ class DashboardService:
         dashboard_data = await self.get_dashboard_data(refresh_cache=True)
 
         # Dados do mês
-        today = datetime.utcnow().date()
+        today = datetime.now(UTC).date()
         month_start = today.replace(day=1)
         if today.month == 12:
             month_end = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
         else:
             month_end = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
 
-        pokemons, _ = await self.db_service.list_pokemons(skip=0, limit=10000)
-        monthly_additions = [
-            p for p in pokemons
-            if month_start <= p.created_at.date() <= month_end
-        ]
+        monthly_additions = await self._get_additions(month_start, month_end)
 
         # Análise mensal detalhada
+        additions_by_day = Counter(p.created_at.date() for p in monthly_additions)
         weekly_breakdown = {}
         current_week_start = month_start
         week_num = 1
 
         while current_week_start <= month_end:
             week_end = min(current_week_start + timedelta(days=6), month_end)
-            week_additions = [
-                p for p in monthly_additions
-                if current_week_start <= p.created_at.date() <= week_end
-            ]
             weekly_breakdown[f"week_{week_num}"] = {
                 "start": current_week_start.isoformat(),
                 "end": week_end.isoformat(),
-                "additions": len(week_additions)
+                "additions": sum(
+                    count for day, count in additions_by_day.items()
+                    if current_week_start <= day <= week_end
+                )
             }
             current_week_start += timedelta(days=7)
             week_num += 1
@@ -572,7 +711,7 @@ class DashboardService:
             "month": f"{today.year}-{today.month:02d}",
             "month_start": month_start.isoformat(),
             "month_end": month_end.isoformat(),
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": datetime.now(UTC).isoformat(),
             "summary": {
                 "total_pokemons": dashboard_data["summary"]["total_pokemons"],
                 "monthly_additions": len(monthly_additions),
@@ -590,8 +729,7 @@ class DashboardService:
         filename = f"monthly_report_{timestamp}.json"
         filepath = self.reports_dir / filename
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        await _write_report_json(filepath, report_data)
 
         logger.info(f"Relatório mensal gerado: {filepath}")
         return str(filepath)
@@ -605,8 +743,7 @@ class DashboardService:
 
         type_counts = Counter()
         for pokemon in pokemons:
-            for ptype in pokemon.types:
-                type_counts[ptype.name] += 1
+            type_counts.update(pokemon.type_names)
 
         return {
             "most_added_types": dict(type_counts.most_common(5)),
@@ -692,107 +829,39 @@ class DashboardService:
         """
         dashboard_data = await self.get_dashboard_data()
 
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Pokemon Dashboard</title>
-            <meta charset="utf-8">
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-                .container {{ max-width: 1200px; margin: 0 auto; }}
-                .card {{ background: white; padding: 20px; margin: 10px 0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-                .header {{ text-align: center; color: #333; }}
-                .stats-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 15px; }}
-                .stat-item {{ background: #e3f2fd; padding: 15px; border-radius: 5px; text-align: center; }}
-                .stat-value {{ font-size: 2em; font-weight: bold; color: #1976d2; }}
-                .stat-label {{ color: #666; margin-top: 5px; }}
-                .top-list {{ list-style: none; padding: 0; }}
-                .top-list li {{ padding: 8px; margin: 5px 0; background: #f8f9fa; border-radius: 4px; }}
-                .quality-score {{ font-size: 1.5em; font-weight: bold; }}
-                .quality-good {{ color: #4caf50; }}
-                .quality-medium {{ color: #ff9800; }}
-                .quality-poor {{ color: #f44336; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="card">
-                    <h1 class="header">🎮 Pokemon Dashboard</h1>
-                    <p class="header">Gerado em: {dashboard_data['generated_at']}</p>
-                </div>
-
-                <div class="card">
-                    <h2>📊 Resumo Geral</h2>
-                    <div class="stats-grid">
-                        <div class="stat-item">
-                            <div class="stat-value">{dashboard_data['summary']['total_pokemons']}</div>
-                            <div class="stat-label">Total de Pokémons</div>
-                        </div>
-                        <div class="stat-item">
-                            <div class="stat-value">{dashboard_data['summary']['unique_types']}</div>
-                            <div class="stat-label">Tipos Únicos</div>
-                        </div>
-                        <div class="stat-item">
-                            <div class="stat-value">{dashboard_data['summary']['average_base_experience']}</div>
-                            <div class="stat-label">Experiência Média</div>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="card">
-                    <h2>🏆 Top Rankings</h2>
-                    <div class="stats-grid">
-                        <div>
-                            <h3>💪 Maior Ataque</h3>
-                            <ul class="top-list">
-                                {''.join([f'<li>{p["name"]} - {p["value"]}</li>' for p in dashboard_data["top_rankings"]["top_attack"][:5]])}
-                            </ul>
-                        </div>
-                        <div>
-                            <h3>🛡️ Maior Defesa</h3>
-                            <ul class="top-list">
-                                {''.join([f'<li>{p["name"]} - {p["value"]}</li>' for p in dashboard_data["top_rankings"]["top_defense"][:5]])}
-                            </ul>
-                        </div>
-                        <div>
-                            <h3>⚡ Maior Velocidade</h3>
-                            <ul class="top-list">
-                                {''.join([f'<li>{p["name"]} - {p["value"]}</li>' for p in dashboard_data["top_rankings"]["top_speed"][:5]])}
-                            </ul>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="card">
-                    <h2>📈 Qualidade dos Dados</h2>
-                    <div class="quality-score {'quality-good' if dashboard_data['data_quality']['quality_score'] >= 85 else 'quality-medium' if dashboard_data['data_quality']['quality_score'] >= 70 else 'quality-poor'}">
-                        Score: {dashboard_data['data_quality']['quality_score']}%
-                    </div>
-                    <h3>Recomendações:</h3>
-                    <ul>
-                        {''.join([f'<li>{rec}</li>' for rec in dashboard_data['data_quality']['recommendations']])}
-                    </ul>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        # Mesmos dados já renderizados: reaproveitar o arquivo gerado
+        key = hashlib.blake2b(self._serialized_dashboard(dashboard_data), digest_size=16).hexdigest()
+        cached_file = self._html_cache.get(key)
+        if cached_file is not None and Path(cached_file).exists():
+            self._html_cache.move_to_end(key)
+            logger.info(f"Dashboard HTML reaproveitado do cache: {cached_file}")
+            return cached_file
+
+        # Só os rankings exibidos, já cortados no tamanho usado pelo template
+        rankings = {
+            name: dashboard_data["top_rankings"][name][:HTML_RANKING_SIZE]
+            for name in HTML_RANKINGS
+        }
+        html_content = self._html_template.render(dashboard=dashboard_data, rankings=rankings)
 
         # Salvar HTML
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
         html_file = self.reports_dir / f"dashboard_{timestamp}.html"
 
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        async with aiofiles.open(html_file, 'w', encoding='utf-8') as f:
+            await f.write(html_content)
+
+        self._html_cache[key] = str(html_file)
+        self._html_cache.move_to_end(key)
+        while len(self._html_cache) > HTML_CACHE_SIZE:
+            self._html_cache.popitem(last=False)
 
         logger.info(f"Dashboard HTML gerado: {html_file}")
         return str(html_file)
 
-    async def clear_cache(self):
+    def clear_cache(self):
         """
         Limpa cache do dashboard.
         """
-        self.cache.clear()
-        self.last_cache_update.clear()
+        self._invalidate_cache()
         logger.info("Cache do dashboard limpo")
@@ -1,14 +1,74 @@
-import os
+import asyncio
 import logging
-from typing import List, Optional, Tuple, Dict, Any
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
-from pymongo.errors import DuplicateKeyError
-from datetime import datetime
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+from datetime import UTC, datetime
 
+from app.config import get_settings
 from app.models.pokemon import Pokemon
 
 logger = logging.getLogger(__name__)
 
+# Projeção das leituras: o _id do MongoDB não faz parte do modelo Pokemon
+NO_ID = {"_id": 0}
+
+# Documentos por chamada de bulk_write em save_pokemons
+SAVE_BATCH_SIZE = 1000
+
+# Índices secundários (além do único de nome): created_at serve aos relatórios
+# por data. Podem ser removidos durante cargas em massa (bulk_import_mode)
+SECONDARY_INDEXES = ("created_at",)
+
+# Índices de versões anteriores que nenhuma consulta usa
+OBSOLETE_INDEXES = ("id_1",)
+
+# Documentos por lote lido do cursor em iter_pokemons
+READ_BATCH_SIZE = 1000
+
+# Colunas de list_pokemons_flat, na ordem da exportação CSV
+FLAT_COLUMNS = (
+    "id", "name", "height", "weight", "base_experience", "types", "abilities",
+    "hp", "attack", "defense", "special_attack", "special_defense", "speed",
+    "created_at", "updated_at"
+)
+
+# Acima deste skip a paginação por offset fica cara; o cursor deve ser usado
+DEEP_SKIP_WARNING = 10_000
+
+
+def _upsert_update(pokemon_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """
+    Monta o documento de update do upsert de um pokémon.
+    O próprio pokemon_data vira o $set, sem cópia: o chamador não deve reutilizá-lo.
+    """
+    # _id é imutável e created_at só é gravado na inserção
+    pokemon_data.pop("_id", None)
+    pokemon_data.pop("created_at", None)
+    pokemon_data["updated_at"] = now
+    return {"$set": pokemon_data, "$setOnInsert": {"created_at": now}}
+
+
+def _upsert_operation(pokemon_data: Dict[str, Any], now: datetime) -> UpdateOne:
+    """
+    Monta o upsert de um pokémon, identificado pelo nome, para bulk_write.
+    """
+    return UpdateOne({"name": pokemon_data["name"]}, _upsert_update(pokemon_data, now), upsert=True)
+
+
+def _stat_expression(stat: str) -> Any:
+    """
+    Expressão de agregação do valor de um stat. Documentos gravados a partir
+    do modelo usam o nome do campo (special_attack); os da API, o alias (special-attack).
+    """
+    alias = stat.replace("_", "-")
+    if alias == stat:
+        return f"$stats.{stat}"
+    return {"$ifNull": [f"$stats.{stat}", f"$stats.{alias}"]}
+
 
 class DatabaseService:
     """
@@ -16,113 +76,240 @@ class DatabaseService:
     """
     
     def __init__(self):
-        self.mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-        self.database_name = os.getenv("DATABASE_NAME", "pokemon_db")
+        settings = get_settings()
+        self.settings = settings
+        self.mongodb_url = settings.mongodb_url
+        self.database_name = settings.database_name
         self.client: Optional[AsyncIOMotorClient] = None
         self.database: Optional[AsyncIOMotorDatabase] = None
         self.pokemon_collection: Optional[AsyncIOMotorCollection] = None
-        
-    async def connect(self):
+        # Callbacks chamados após cada escrita, para invalidar caches derivados
+        self._invalidators: List[Callable[[], None]] = []
+        # Último resultado do health check (instante monotônico, resultado)
+        self._health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._health_ttl = settings.health_cache_ttl
+        self._health_lock = asyncio.Lock()
+    
+    def add_invalidator(self, callback: Callable[[], None]):
+        """
+        Registra um callback chamado sempre que a coleção de pokémons muda.
+        """
+        self._invalidators.append(callback)
+    
+    def _notify_write(self):
+        """
+        Avisa os caches registrados de que os dados mudaram.
+        """
+        for invalidate in self._invalidators:
+            invalidate()
+    
+    async def connect(self, create_indexes: Optional[bool] = None):
         """
         Conecta ao MongoDB.
+        Os índices só são criados com create_indexes=True ou, se omitido,
+        com RUN_MIGRATIONS habilitado; em produção use `python -m app.migrate`.
         """
         try:
             logger.info(f"Connecting to MongoDB at: {self.mongodb_url}")
             
-            self.client = AsyncIOMotorClient(self.mongodb_url)
+            # Cliente único da aplicação: pool dimensionado para as consultas
+            # concorrentes, compressão de rede e write concern configuráveis
+            client_options = {}
+            # Sem MONGO_JOURNAL o servidor decide (journal habilitado por padrão)
+            if self.settings.mongo_journal is not None:
+                client_options["journal"] = self.settings.mongo_journal
+            self.client = AsyncIOMotorClient(
+                self.mongodb_url,
+                tz_aware=True,
+                maxPoolSize=self.settings.mongo_pool_size,
+                minPoolSize=self.settings.mongo_min_pool_size,
+                compressors=self.settings.mongo_compressors,
+                retryWrites=True,
+                w=self.settings.mongo_write_concern_w,
+                **client_options
+            )
             self.database = self.client[self.database_name]
             self.pokemon_collection = self.database["pokemons"]
             
             # Criar índices
-            await self._create_indexes()
+            if create_indexes is None:
+                create_indexes = self.settings.run_migrations
+            if create_indexes:
+                try:
+                    await self.create_indexes()
+                except Exception as e:
+                    logger.error(f"Error creating indexes: {str(e)}")
             
             # Testar conexão
             await self.client.admin.command('ping')
+            
+            if not create_indexes:
+                await self._check_name_index()
             logger.info("Successfully connected to MongoDB")
             
         except Exception as e:
             logger.error(f"Error connecting to MongoDB: {str(e)}")
             raise
     
+    async def _check_name_index(self):
+        """
+        Avisa quando falta o índice único de nome, do qual dependem os upserts
+        e a paginação por cursor (criado por `python -m app.migrate`).
+        """
+        try:
+            indexes = await self.pokemon_collection.index_information()
+        except Exception as e:
+            logger.warning(f"Could not verify the pokemon indexes: {str(e)}")
+            return
+        
+        if not any(index.get("unique") and index["key"] == [("name", 1)] for index in indexes.values()):
+            logger.warning(
+                "Unique index on pokemons.name is missing: run `python -m app.migrate` "
+                "or start with RUN_MIGRATIONS=1"
+            )
+    
     async def disconnect(self):
         """
         Desconecta do MongoDB.
         """
+        self._health_cache = None
         if self.client:
             self.client.close()
             logger.info("Disconnected from MongoDB")
     
-    async def _create_indexes(self):
+    async def create_indexes(self):
         """
         Cria índices necessários no banco de dados.
         """
+        # Índice único no nome do pokémon (buscas, upserts e paginação)
+        await self.pokemon_collection.create_index("name", unique=True)
+        
+        # Índices secundários (data de criação)
+        for field in SECONDARY_INDEXES:
+            await self.pokemon_collection.create_index(field)
+        
+        # Cada índice a mais é escrito em toda gravação: remover os sem leitores
+        for index_name in OBSOLETE_INDEXES:
+            try:
+                await self.pokemon_collection.drop_index(index_name)
+                logger.info(f"Dropped unused index {index_name}")
+            except OperationFailure:
+                pass
+        
+        logger.info("Database indexes created successfully")
+    
+    @asynccontextmanager
+    async def bulk_import_mode(self) -> AsyncIterator[None]:
+        """
+        Remove os índices secundários durante uma carga em massa e os recria
+        ao final. O índice único de nome é mantido, pois os upserts dependem dele.
+        """
+        for field in SECONDARY_INDEXES:
+            try:
+                await self.pokemon_collection.drop_index(f"{field}_1")
+            except OperationFailure:
+                pass
         try:
-            # Índice único no nome do pokémon
-            await self.pokemon_collection.create_index("name", unique=True)
-            
-            # Índice no ID do pokémon
-            await self.pokemon_collection.create_index("id")
-            
-            # Índice na data de criação
-            await self.pokemon_collection.create_index("created_at")
-            
-            logger.info("Database indexes created successfully")
-            
-        except Exception as e:
-            logger.error(f"Error creating indexes: {str(e)}")
+            yield
+        finally:
+            for field in SECONDARY_INDEXES:
+                await self.pokemon_collection.create_index(field)
+            logger.info("Secondary indexes rebuilt after bulk import")
     
     async def save_pokemon(self, pokemon_data: Dict[str, Any]) -> Pokemon:
         """
         Salva um pokémon no banco de dados.
+        O dicionário recebido é reaproveitado (e alterado) no update.
         """
         try:
-            # Adicionar timestamps
-            now = datetime.utcnow()
-            pokemon_data["created_at"] = now
-            pokemon_data["updated_at"] = now
-            
-            # Tentar inserir
-            try:
-                result = await self.pokemon_collection.insert_one(pokemon_data)
-                logger.info(f"Pokemon {pokemon_data['name']} saved with ID: {result.inserted_id}")
-                
-            except DuplicateKeyError:
-                # Se já existe, atualizar
-                pokemon_data["updated_at"] = now
-                # Remover _id se existir para evitar erro de campo imutável
-                update_data = {k: v for k, v in pokemon_data.items() if k != "_id"}
-                await self.pokemon_collection.update_one(
-                    {"name": pokemon_data["name"]},
-                    {"$set": update_data}
-                )
-                logger.info(f"Pokemon {pokemon_data['name']} updated")
-            
-            # Retornar o pokémon salvo
-            saved_pokemon = await self.pokemon_collection.find_one(
-                {"name": pokemon_data["name"]}
+            # Upsert e leitura do documento resultante na mesma ida ao banco
+            saved_pokemon = await self.pokemon_collection.find_one_and_update(
+                {"name": pokemon_data["name"]},
+                _upsert_update(pokemon_data, datetime.now(UTC)),
+                projection=NO_ID,
+                upsert=True,
+                return_document=ReturnDocument.AFTER
             )
+            self._notify_write()
             
-            if saved_pokemon:
-                # Remover _id do MongoDB para serialização
-                saved_pokemon.pop("_id", None)
-                return Pokemon(**saved_pokemon)
-            else:
-                raise Exception("Failed to retrieve saved pokemon")
+            logger.info(f"Pokemon {pokemon_data['name']} saved")
+            return Pokemon(**saved_pokemon)
                 
         except Exception as e:
             logger.error(f"Error saving pokemon: {str(e)}")
             raise
     
+    async def save_pokemons(self, pokemons_data: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Salva (insere ou atualiza, pelo nome) vários pokémons com bulk_write
+        não ordenado, em lotes de até SAVE_BATCH_SIZE documentos por ida ao banco.
+        created_at só é definido na inserção; updated_at a cada gravação.
+        Os dicionários recebidos são reaproveitados (e alterados) nos updates.
+        Falhas de escrita em um lote não interrompem os seguintes: ao final é
+        levantado um BulkWriteError com os totais gravados e os writeErrors
+        indexados pela posição em pokemons_data.
+        """
+        now = datetime.now(UTC)
+        inserted = 0
+        updated = 0
+        write_errors: List[Dict[str, Any]] = []
+        write_concern_errors: List[Dict[str, Any]] = []
+        
+        try:
+            for start in range(0, len(pokemons_data), SAVE_BATCH_SIZE):
+                batch = pokemons_data[start:start + SAVE_BATCH_SIZE]
+                operations = [_upsert_operation(pokemon_data, now) for pokemon_data in batch]
+                try:
+                    result = await self.pokemon_collection.bulk_write(operations, ordered=False)
+                    inserted += result.upserted_count
+                    updated += result.matched_count
+                except BulkWriteError as e:
+                    # Lote não ordenado: as demais operações foram gravadas
+                    inserted += e.details.get("nUpserted", 0)
+                    updated += e.details.get("nMatched", 0)
+                    write_errors.extend(
+                        {**error, "index": start + error["index"]}
+                        for error in e.details.get("writeErrors", [])
+                    )
+                    write_concern_errors.extend(e.details.get("writeConcernErrors", []))
+                
+                logger.debug(
+                    "Saved batch %d-%d of %d pokemons (%d inserted, %d updated, %d errors so far)",
+                    start, start + len(batch), len(pokemons_data), inserted, updated, len(write_errors)
+                )
+                
+        except Exception as e:
+            logger.error(
+                f"Error saving pokemons after {inserted + updated} of {len(pokemons_data)} written: {str(e)}"
+            )
+            raise
+        
+        finally:
+            if inserted or updated:
+                self._notify_write()
+        
+        if write_errors or write_concern_errors:
+            logger.error(
+                f"Saved {inserted + updated} of {len(pokemons_data)} pokemons; {len(write_errors)} write errors"
+            )
+            raise BulkWriteError({
+                "nUpserted": inserted,
+                "nMatched": updated,
+                "writeErrors": write_errors,
+                "writeConcernErrors": write_concern_errors
+            })
+        
+        logger.info(f"Saved {len(pokemons_data)} pokemons ({inserted} inserted, {updated} updated)")
+        return {"inserted": inserted, "updated": updated}
+    
     async def get_pokemon_by_name(self, name: str) -> Optional[Pokemon]:
         """
         Busca um pokémon pelo nome.
         """
         try:
-            pokemon_doc = await self.pokemon_collection.find_one({"name": name})
+            pokemon_doc = await self.pokemon_collection.find_one({"name": name}, projection=NO_ID)
             
             if pokemon_doc:
-                # Remover _id do MongoDB para serialização
-                pokemon_doc.pop("_id", None)
                 return Pokemon(**pokemon_doc)
             
             return None
@@ -131,23 +318,30 @@ class DatabaseService:
             logger.error(f"Error getting pokemon by name {name}: {str(e)}")
             raise
     
-    async def list_pokemons(self, skip: int = 0, limit: int = 100) -> Tuple[List[Pokemon], int]:
+    async def list_pokemons(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None
+    ) -> Tuple[List[Pokemon], int]:
         """
-        Lista pokémons com paginação.
+        Lista pokémons ordenados por nome, com paginação.
+        `after` é o cursor (nome do último pokémon da página anterior) e usa o
+        índice único de nome; `skip` é mantido por compatibilidade.
         """
         try:
-            # Contar total de documentos
-            total = await self.pokemon_collection.count_documents({})
-            
-            # Buscar pokémons com paginação
-            cursor = self.pokemon_collection.find({}).skip(skip).limit(limit).sort("name", 1)
-            pokemon_docs = await cursor.to_list(length=limit)
+            if skip > DEEP_SKIP_WARNING:
+                logger.warning(
+                    "Paginação com skip=%d percorre todos os documentos anteriores; use o cursor 'after'",
+                    skip
+                )
             
-            # Converter para objetos Pokemon
-            pokemons = []
-            for doc in pokemon_docs:
-                doc.pop("_id", None)  # Remover _id do MongoDB
-                pokemons.append(Pokemon(**doc))
+            # Total (pelos metadados da coleção, sem varrer documentos) e
+            # página consultados em paralelo
+            total, pokemons = await asyncio.gather(
+                self.pokemon_collection.estimated_document_count(),
+                self._collect_pokemons(skip=skip, limit=limit, after=after)
+            )
             
             logger.info(f"Retrieved {len(pokemons)} pokemons (total: {total})")
             return pokemons, total
@@ -156,6 +350,228 @@ class DatabaseService:
             logger.error(f"Error listing pokemons: {str(e)}")
             raise
     
+    async def _collect_pokemons(self, skip: int, limit: int, after: Optional[str]) -> List[Pokemon]:
+        """
+        Materializa a página de iter_pokemons em uma lista.
+        """
+        return [pokemon async for pokemon in self.iter_pokemons(skip=skip, limit=limit, after=after)]
+    
+    async def iter_pokemons(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None
+    ) -> AsyncIterator[Pokemon]:
+        """
+        Percorre os pokémons ordenados por nome, com os mesmos parâmetros de
+        paginação de list_pokemons, convertendo cada documento à medida que
+        os lotes chegam do cursor, sem materializar a página inteira.
+        """
+        query = {"name": {"$gt": after}} if after else {}
+        cursor = self.pokemon_collection.find(query, projection=NO_ID).sort("name", 1)
+        if skip:
+            cursor = cursor.skip(skip)
+        cursor = cursor.limit(limit).batch_size(min(limit, READ_BATCH_SIZE))
+        
+        async for doc in cursor:
+            yield Pokemon(**doc)
+    
+    async def list_pokemons_flat(self, limit: int = 10000) -> Dict[str, List[Any]]:
+        """
+        Lê os pokémons ordenados por nome já em colunas (FLAT_COLUMNS), para
+        exportações tabulares, sem montar objetos Pokemon. Tipos e habilidades
+        vêm como nomes separados por vírgula e as datas em ISO 8601.
+        """
+        try:
+            columns: Dict[str, List[Any]] = {column: [] for column in FLAT_COLUMNS}
+            async for batch in self.iter_pokemons_flat(limit=limit):
+                for column, values in batch.items():
+                    columns[column].extend(values)
+            
+            logger.info(f"Retrieved {len(columns['id'])} pokemons as columns")
+            return columns
+            
+        except Exception as e:
+            logger.error(f"Error listing pokemons as columns: {str(e)}")
+            raise
+    
+    async def iter_pokemons_flat(
+        self,
+        limit: int = 10000,
+        batch_size: int = READ_BATCH_SIZE
+    ) -> AsyncIterator[Dict[str, List[Any]]]:
+        """
+        Percorre os pokémons de list_pokemons_flat em lotes de até batch_size,
+        cada um já em colunas, à medida que chegam do cursor.
+        """
+        projection = {
+            "_id": 0, "id": 1, "name": 1, "height": 1, "weight": 1, "base_experience": 1,
+            "types.name": 1, "abilities.name": 1, "stats": 1, "created_at": 1, "updated_at": 1
+        }
+        cursor = self.pokemon_collection.find({}, projection=projection).sort("name", 1)
+        cursor = cursor.limit(limit).batch_size(min(limit, batch_size))
+        
+        columns: Dict[str, List[Any]] = {column: [] for column in FLAT_COLUMNS}
+        append = {column: values.append for column, values in columns.items()}
+        count = 0
+        async for doc in cursor:
+            stats = doc["stats"]
+            append["id"](doc["id"])
+            append["name"](doc["name"])
+            append["height"](doc["height"])
+            append["weight"](doc["weight"])
+            append["base_experience"](doc.get("base_experience"))
+            append["types"](",".join([t["name"] for t in doc.get("types", [])]))
+            append["abilities"](",".join([a["name"] for a in doc.get("abilities", [])]))
+            append["hp"](stats["hp"])
+            append["attack"](stats["attack"])
+            append["defense"](stats["defense"])
+            # Documentos gravados a partir do modelo usam o nome do campo; os da API, o alias
+            append["special_attack"](stats.get("special_attack", stats.get("special-attack")))
+            append["special_defense"](stats.get("special_defense", stats.get("special-defense")))
+            append["speed"](stats["speed"])
+            append["created_at"](doc["created_at"].isoformat())
+            append["updated_at"](doc["updated_at"].isoformat())
+            count += 1
+            
+            if count == batch_size:
+                yield columns
+                columns = {column: [] for column in FLAT_COLUMNS}
+                append = {column: values.append for column, values in columns.items()}
+                count = 0
+        
+        if count:
+            yield columns
+    
+    async def list_pokemons_created_between(self, start: datetime, end: datetime) -> List[Pokemon]:
+        """
+        Lista, ordenados por nome, os pokémons criados no intervalo [start, end),
+        usando o índice de created_at.
+        """
+        try:
+            cursor = self.pokemon_collection.find(
+                {"created_at": {"$gte": start, "$lt": end}},
+                projection=NO_ID
+            ).sort("name", 1)
+            
+            pokemons = [Pokemon(**doc) async for doc in cursor]
+            
+            logger.info(f"Retrieved {len(pokemons)} pokemons created between {start} and {end}")
+            return pokemons
+            
+        except Exception as e:
+            logger.error(f"Error listing pokemons by creation date: {str(e)}")
+            raise
+    
+    async def get_stats_aggregates(
+        self,
+        stats: Tuple[str, ...],
+        top_stats: Tuple[str, ...],
+        top_size: int
+    ) -> Dict[str, Any]:
+        """
+        Agrega no MongoDB os números de generate_aggregations: total, média,
+        mínimo, máximo e mediana (elemento central, o superior com N par) de
+        cada stat, contagem por tipo e os top_size pokémons de cada top_stats
+        (empates por nome).
+        """
+        try:
+            summary_group: Dict[str, Any] = {"_id": None, "count": {"$sum": 1}}
+            summary_project: Dict[str, Any] = {"_id": 0, "count": 1}
+            middle = {"$toInt": {"$floor": {"$divide": ["$count", 2]}}}
+            for stat in stats:
+                expression = _stat_expression(stat)
+                summary_group[f"{stat}_mean"] = {"$avg": expression}
+                summary_group[f"{stat}_min"] = {"$min": expression}
+                summary_group[f"{stat}_max"] = {"$max": expression}
+                summary_group[f"{stat}_values"] = {"$push": expression}
+                summary_project[stat] = {
+                    "mean": f"${stat}_mean",
+                    "min": f"${stat}_min",
+                    "max": f"${stat}_max",
+                    "median": {"$arrayElemAt": [
+                        {"$sortArray": {"input": f"${stat}_values", "sortBy": 1}},
+                        middle
+                    ]}
+                }
+            
+            facets: Dict[str, Any] = {
+                "summary": [{"$group": summary_group}, {"$project": summary_project}],
+                "types": [
+                    {"$unwind": "$types"},
+                    {"$group": {"_id": "$types.name", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}}
+                ]
+            }
+            for stat in top_stats:
+                facets[f"top_{stat}"] = [
+                    {"$sort": {f"stats.{stat}": -1, "name": 1}},
+                    {"$limit": top_size},
+                    {"$project": {"_id": 0, "name": 1, stat: _stat_expression(stat)}}
+                ]
+            
+            result = (await self.pokemon_collection.aggregate([{"$facet": facets}]).to_list(length=1))[0]
+            
+            summary = result.pop("summary")
+            types = result.pop("types")
+            return {
+                "total": summary[0].pop("count") if summary else 0,
+                "stats": summary[0] if summary else {},
+                "type_counts": {bucket["_id"]: bucket["count"] for bucket in types},
+                **result
+            }
+            
+        except Exception as e:
+            logger.error(f"Error aggregating pokemon stats: {str(e)}")
+            raise
+    
+    async def get_summary_aggregates(self, generation_boundaries: List[int]) -> Dict[str, Any]:
+        """
+        Agrega no MongoDB os números do resumo do dashboard: contagem de
+        pokémons por faixa de ID (limites inferiores em generation_boundaries;
+        IDs fora das faixas ficam em "other"), total exato, experiência base
+        e tipos distintos.
+        """
+        try:
+            pipeline = [
+                {"$facet": {
+                    "generations": [
+                        {"$bucket": {
+                            "groupBy": "$id",
+                            "boundaries": generation_boundaries,
+                            "default": "other",
+                            "output": {"count": {"$sum": 1}}
+                        }}
+                    ],
+                    "total": [
+                        {"$count": "count"}
+                    ],
+                    "experience": [
+                        {"$match": {"base_experience": {"$ne": None}}},
+                        {"$group": {"_id": None, "count": {"$sum": 1}, "sum": {"$sum": "$base_experience"}}}
+                    ],
+                    "types": [
+                        {"$unwind": "$types"},
+                        {"$group": {"_id": "$types.name"}},
+                        {"$count": "count"}
+                    ]
+                }}
+            ]
+            result = (await self.pokemon_collection.aggregate(pipeline).to_list(length=1))[0]
+            
+            experience = result["experience"][0] if result["experience"] else {"count": 0, "sum": 0}
+            return {
+                "generation_counts": {bucket["_id"]: bucket["count"] for bucket in result["generations"]},
+                "total_count": result["total"][0]["count"] if result["total"] else 0,
+                "experience_count": experience["count"],
+                "experience_sum": experience["sum"],
+                "unique_types": result["types"][0]["count"] if result["types"] else 0
+            }
+            
+        except Exception as e:
+            logger.error(f"Error aggregating dashboard summary: {str(e)}")
+            raise
+    
     async def delete_pokemon(self, name: str) -> bool:
         """
         Remove um pokémon do banco de dados.
@@ -164,6 +580,7 @@ class DatabaseService:
             result = await self.pokemon_collection.delete_one({"name": name})
             
             if result.deleted_count > 0:
+                self._notify_write()
                 logger.info(f"Pokemon {name} deleted successfully")
                 return True
             else:
@@ -177,13 +594,43 @@ class DatabaseService:
     async def health_check(self) -> Dict[str, Any]:
         """
         Verifica a saúde da conexão com o banco de dados.
+        O resultado fica em cache por alguns segundos, e verificações
+        concorrentes aguardam uma única consulta ao banco.
+        """
+        cached = self._cached_health()
+        if cached is not None:
+            return cached
+        
+        async with self._health_lock:
+            cached = self._cached_health()
+            if cached is not None:
+                return cached
+            
+            result = await self._check_health()
+            self._health_cache = (time.monotonic(), result)
+            return result
+    
+    def _cached_health(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o último health check se ainda estiver dentro do TTL.
+        """
+        if self._health_cache is None:
+            return None
+        checked_at, result = self._health_cache
+        if time.monotonic() - checked_at >= self._health_ttl:
+            return None
+        return result
+    
+    async def _check_health(self) -> Dict[str, Any]:
+        """
+        Consulta o banco: ping e contagem estimada de pokémons.
         """
         try:
             # Ping no banco
             await self.client.admin.command('ping')
             
-            # Contar documentos na coleção
-            count = await self.pokemon_collection.count_documents({})
+            # Contar documentos na coleção (estimativa pelos metadados, sem varredura)
+            count = await self.pokemon_collection.estimated_document_count()
             
             return {
                 "status": "healthy",
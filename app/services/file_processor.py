@@ -1,19 +1,67 @@
 import os
-import csv
-import json
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 import asyncio
-from collections import Counter
+import time
+from operator import itemgetter
+from pymongo.errors import BulkWriteError
 
 from app.models.pokemon import Pokemon
 from app.services.database import DatabaseService
 
 logger = logging.getLogger(__name__)
 
+# Stats base resumidos em generate_aggregations e no relatório por tipos
+STAT_FIELDS = ('hp', 'attack', 'defense', 'special_attack', 'special_defense', 'speed')
+
+# Tipos de pokémon conhecidos, usados na limpeza dos dados
+VALID_TYPES = frozenset({
+    'normal', 'fire', 'water', 'electric', 'grass', 'ice', 'fighting',
+    'poison', 'ground', 'flying', 'psychic', 'bug', 'rock', 'ghost',
+    'dragon', 'dark', 'steel', 'fairy'
+})
+
+# Stats com top pokémons nas agregações, e quantos pokémons em cada top
+TOP_STATS = ('attack', 'defense', 'speed')
+TOP_SIZE = 5
+
+# Idade máxima (s) das agregações em cache. Escritas deste processo invalidam
+# o cache na hora; as de outros workers, da migração ou de outros clientes
+# do banco não são notificadas, e este limite evita servi-las indefinidamente
+AGGREGATIONS_MAX_AGE = 300
+
+# Colunas inteiras da importação de CSV/JSON (stats com "_" no lugar de "-")
+IMPORT_INT_COLUMNS = (
+    'id', 'height', 'weight', 'hp', 'attack', 'defense',
+    'special_attack', 'special_defense', 'speed'
+)
+
+
+def _write_json(filepath: Path, data: Any):
+    """
+    Grava dados em JSON indentado (UTF-8) com orjson.
+    """
+    filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
+def _split_names(df: pd.DataFrame, column: str) -> List[List[str]]:
+    """
+    Separa a coluna de nomes separados por vírgula em listas, sem vazios.
+    """
+    if column not in df.columns:
+        return [[] for _ in range(len(df))]
+    return [
+        [name.strip() for name in names if name.strip()]
+        for names in df[column].fillna('').astype(str).str.split(',')
+    ]
+
 
 class FileProcessorMCP:
     """
@@ -30,6 +78,23 @@ class FileProcessorMCP:
         # Criar diretórios se não existirem
         for directory in [self.output_dir, self.reports_dir, self.temp_dir]:
             directory.mkdir(parents=True, exist_ok=True)
+        
+        # Última saída de generate_aggregations (e o instante monotônico do
+        # cálculo), válida até a próxima escrita no banco ou por até
+        # AGGREGATIONS_MAX_AGE; a geração descarta resultados calculados
+        # durante uma escrita
+        self._aggregations: Optional[Dict[str, Any]] = None
+        self._aggregations_computed_at = 0.0
+        self._aggregations_generation = 0
+        self._aggregations_lock = asyncio.Lock()
+        db_service.add_invalidator(self._invalidate_aggregations)
+    
+    def _invalidate_aggregations(self):
+        """
+        Descarta as agregações em cache; chamado pelo DatabaseService após escritas.
+        """
+        self._aggregations_generation += 1
+        self._aggregations = None
     
     async def export_to_csv(self, filename: Optional[str] = None) -> str:
         """
@@ -38,12 +103,6 @@ class FileProcessorMCP:
         try:
             logger.info("Iniciando exportação para CSV")
             
-            # Buscar todos os pokémons
-            pokemons, total = await self.db_service.list_pokemons(skip=0, limit=10000)
-            
-            if not pokemons:
-                raise ValueError("Nenhum pokémon encontrado para exportar")
-            
             # Gerar nome do arquivo se não fornecido
             if not filename:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -51,34 +110,21 @@ class FileProcessorMCP:
             
             filepath = self.output_dir / filename
             
-            # Preparar dados para CSV
-            csv_data = []
-            for pokemon in pokemons:
-                row = {
-                    'id': pokemon.id,
-                    'name': pokemon.name,
-                    'height': pokemon.height,
-                    'weight': pokemon.weight,
-                    'base_experience': pokemon.base_experience,
-                    'types': ','.join([t.name for t in pokemon.types]),
-                    'abilities': ','.join([a.name for a in pokemon.abilities]),
-                    'hp': pokemon.stats.hp,
-                    'attack': pokemon.stats.attack,
-                    'defense': pokemon.stats.defense,
-                    'special_attack': pokemon.stats.special_attack,
-                    'special_defense': pokemon.stats.special_defense,
-                    'speed': pokemon.stats.speed,
-                    'created_at': pokemon.created_at.isoformat(),
-                    'updated_at': pokemon.updated_at.isoformat()
-                }
-                csv_data.append(row)
-            
-            # Escrever CSV
+            # Escrever CSV lote a lote, a partir de DataFrames colunares, à
+            # medida que os pokémons chegam do banco; Int64 mantém a
+            # experiência como inteiro, com célula vazia quando ausente, e o
+            # terminador \r\n é o mesmo do formato CSV padrão
+            written = 0
             with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = csv_data[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(csv_data)
+                async for columns in self.db_service.iter_pokemons_flat(limit=10000):
+                    df = pd.DataFrame(columns)
+                    df['base_experience'] = df['base_experience'].astype('Int64')
+                    df.to_csv(csvfile, index=False, header=written == 0, lineterminator='\r\n')
+                    written += len(df)
+            
+            if not written:
+                filepath.unlink(missing_ok=True)
+                raise ValueError("Nenhum pokémon encontrado para exportar")
             
             logger.info(f"Exportação CSV concluída: {filepath}")
             return str(filepath)
@@ -87,6 +133,37 @@ class FileProcessorMCP:
             logger.error(f"Erro na exportação CSV: {str(e)}")
             raise
     
+    async def export_to_feather(self, filename: Optional[str] = None) -> str:
+        """
+        Exporta dados dos pokémons para arquivo Arrow/Feather (compressão zstd).
+        """
+        try:
+            logger.info("Iniciando exportação para Feather")
+            
+            # Buscar todos os pokémons, já em colunas
+            columns = await self.db_service.list_pokemons_flat(limit=10000)
+            
+            if not columns['id']:
+                raise ValueError("Nenhum pokémon encontrado para exportar")
+            
+            # Gerar nome do arquivo se não fornecido
+            if not filename:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"pokemons_export_{timestamp}.feather"
+            
+            filepath = self.output_dir / filename
+            
+            # Tabela montada direto das colunas, sem passar por DataFrame
+            table = pa.Table.from_pydict(columns)
+            feather.write_feather(table, filepath, compression='zstd', compression_level=3)
+            
+            logger.info(f"Exportação Feather concluída: {filepath}")
+            return str(filepath)
+            
+        except Exception as e:
+            logger.error(f"Erro na exportação Feather: {str(e)}")
+            raise
+    
     async def export_to_json(self, filename: Optional[str] = None) -> str:
         """
         Exporta dados dos pokémons para arquivo JSON.
@@ -107,22 +184,13 @@ class FileProcessorMCP:
             
             filepath = self.output_dir / filename
             
-            # Converter para dicionários serializáveis
-            json_data = []
-            for pokemon in pokemons:
-                pokemon_dict = pokemon.dict()
-                # Converter datetime para string
-                pokemon_dict['created_at'] = pokemon.created_at.isoformat()
-                pokemon_dict['updated_at'] = pokemon.updated_at.isoformat()
-                json_data.append(pokemon_dict)
-            
-            # Escrever JSON
-            with open(filepath, 'w', encoding='utf-8') as jsonfile:
-                json.dump({
-                    'export_timestamp': datetime.now().isoformat(),
-                    'total_pokemons': len(json_data),
-                    'data': json_data
-                }, jsonfile, indent=2, ensure_ascii=False)
+            # Escrever JSON (as datas são serializadas em ISO 8601 pelo orjson)
+            json_data = [pokemon.model_dump() for pokemon in pokemons]
+            _write_json(filepath, {
+                'export_timestamp': datetime.now().isoformat(),
+                'total_pokemons': len(json_data),
+                'data': json_data
+            })
             
             logger.info(f"Exportação JSON concluída: {filepath}")
             return str(filepath)
@@ -144,8 +212,9 @@ class FileProcessorMCP:
             if not pokemons:
                 return {"message": "Nenhum pokémon encontrado", "processed": 0}
             
-            processed_count = 0
             issues_found = []
+            # Pokémons alterados, gravados de uma vez ao final
+            dirty: List[Dict[str, Any]] = []
             
             for pokemon in pokemons:
                 original_name = pokemon.name
@@ -158,29 +227,32 @@ class FileProcessorMCP:
                     needs_update = True
                 
                 # Validar e corrigir stats negativos
-                stats_dict = pokemon.stats.dict()
-                for stat_name, stat_value in stats_dict.items():
+                # Cópia dos itens: os valores negativos são corrigidos durante o laço
+                for stat_name, stat_value in list(pokemon.stats.__dict__.items()):
                     if stat_value < 0:
                         issues_found.append(f"Stat negativo encontrado em {original_name}: {stat_name}={stat_value}")
                         setattr(pokemon.stats, stat_name, 0)
                         needs_update = True
                 
-                # Validar tipos conhecidos
-                valid_types = {
-                    'normal', 'fire', 'water', 'electric', 'grass', 'ice', 'fighting',
-                    'poison', 'ground', 'flying', 'psychic', 'bug', 'rock', 'ghost',
-                    'dragon', 'dark', 'steel', 'fairy'
-                }
-                
-                for pokemon_type in pokemon.types:
-                    if pokemon_type.name not in valid_types:
-                        issues_found.append(f"Tipo inválido encontrado em {original_name}: {pokemon_type.name}")
+                # Validar tipos conhecidos (mensagens só para os tipos inválidos)
+                if not VALID_TYPES.issuperset(pokemon.type_names):
+                    for type_name in pokemon.type_names:
+                        if type_name not in VALID_TYPES:
+                            issues_found.append(f"Tipo inválido encontrado em {original_name}: {type_name}")
                 
-                # Atualizar no banco se necessário
+                # Atualizar no banco se necessário (updated_at é definido na gravação)
                 if needs_update:
-                    pokemon.updated_at = datetime.utcnow()
-                    await self.db_service.save_pokemon(pokemon.dict())
-                    processed_count += 1
+                    dirty.append(pokemon.model_dump())
+            
+            processed_count = len(dirty)
+            if dirty:
+                try:
+                    await self.db_service.save_pokemons(dirty)
+                except BulkWriteError as e:
+                    # Gravação parcial: os demais pokémons já foram corrigidos
+                    processed_count = e.details["nUpserted"] + e.details["nMatched"]
+                    for error in e.details["writeErrors"]:
+                        issues_found.append(f"Erro ao gravar {dirty[error['index']]['name']}: {error['errmsg']}")
             
             result = {
                 "message": "Limpeza e normalização concluída",
@@ -200,53 +272,61 @@ class FileProcessorMCP:
     async def generate_aggregations(self) -> Dict[str, Any]:
         """
         Gera agregações e estatísticas dos dados dos pokémons.
+        O resultado é compartilhado entre os relatórios até a próxima escrita
+        (ou por no máximo AGGREGATIONS_MAX_AGE segundos), e chamadas
+        concorrentes aguardam um único cálculo.
+        """
+        cached = self._cached_aggregations()
+        if cached is not None:
+            return cached
+        
+        async with self._aggregations_lock:
+            cached = self._cached_aggregations()
+            if cached is not None:
+                return cached
+            
+            generation = self._aggregations_generation
+            aggregations = await self._compute_aggregations()
+            if generation == self._aggregations_generation:
+                self._aggregations = aggregations
+                self._aggregations_computed_at = time.monotonic()
+            return aggregations
+    
+    def _cached_aggregations(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna as agregações em cache se ainda estiverem dentro da idade máxima.
+        """
+        if self._aggregations is None:
+            return None
+        if time.monotonic() - self._aggregations_computed_at >= AGGREGATIONS_MAX_AGE:
+            return None
+        return self._aggregations
+    
+    async def _compute_aggregations(self) -> Dict[str, Any]:
+        """
+        Calcula as agregações no banco.
         """
         try:
             logger.info("Gerando agregações dos dados")
             
-            # Buscar todos os pokémons
-            pokemons, total = await self.db_service.list_pokemons(skip=0, limit=10000)
+            # Estatísticas, contagem por tipo e tops calculados no MongoDB
+            result = await self.db_service.get_stats_aggregates(
+                STAT_FIELDS, TOP_STATS, TOP_SIZE
+            )
             
-            if not pokemons:
+            if not result["total"]:
                 return {"message": "Nenhum pokémon encontrado", "aggregations": {}}
             
-            # Contagem por tipo
-            type_counts = Counter()
-            for pokemon in pokemons:
-                for pokemon_type in pokemon.types:
-                    type_counts[pokemon_type.name] += 1
-            
-            # Estatísticas de stats
-            stats_data = {
-                'hp': [p.stats.hp for p in pokemons],
-                'attack': [p.stats.attack for p in pokemons],
-                'defense': [p.stats.defense for p in pokemons],
-                'special_attack': [p.stats.special_attack for p in pokemons],
-                'special_defense': [p.stats.special_defense for p in pokemons],
-                'speed': [p.stats.speed for p in pokemons]
+            stats_summary = {
+                stat_name: {**summary, 'mean': round(summary['mean'], 2)}
+                for stat_name, summary in result["stats"].items()
             }
             
-            stats_summary = {}
-            for stat_name, values in stats_data.items():
-                stats_summary[stat_name] = {
-                    'mean': round(sum(values) / len(values), 2),
-                    'min': min(values),
-                    'max': max(values),
-                    'median': sorted(values)[len(values) // 2]
-                }
-            
-            # Top pokémons por stat
-            top_attack = sorted(pokemons, key=lambda p: p.stats.attack, reverse=True)[:5]
-            top_defense = sorted(pokemons, key=lambda p: p.stats.defense, reverse=True)[:5]
-            top_speed = sorted(pokemons, key=lambda p: p.stats.speed, reverse=True)[:5]
-            
             aggregations = {
-                "total_pokemons": total,
-                "type_distribution": dict(type_counts.most_common()),
+                "total_pokemons": result["total"],
+                "type_distribution": result["type_counts"],
                 "stats_summary": stats_summary,
-                "top_attack": [{"name": p.name, "attack": p.stats.attack} for p in top_attack],
-                "top_defense": [{"name": p.name, "defense": p.stats.defense} for p in top_defense],
-                "top_speed": [{"name": p.name, "speed": p.stats.speed} for p in top_speed],
+                **{f"top_{stat}": result[f"top_{stat}"] for stat in TOP_STATS},
                 "generation_timestamp": datetime.now().isoformat()
             }
             
@@ -257,9 +337,10 @@ class FileProcessorMCP:
             logger.error(f"Erro na geração de agregações: {str(e)}")
             raise
 
-    async def generate_report(self, report_type: str = "summary") -> str:
+    async def generate_report(self, report_type: str = "summary", include_members: bool = False) -> str:
         """
         Gera relatório automático dos dados dos pokémons.
+        include_members inclui a lista de pokémons de cada tipo em types_analysis.
         """
         try:
             logger.info(f"Gerando relatório: {report_type}")
@@ -271,7 +352,7 @@ class FileProcessorMCP:
             elif report_type == "detailed":
                 return await self._generate_detailed_report(timestamp)
             elif report_type == "types_analysis":
-                return await self._generate_types_analysis_report(timestamp)
+                return await self._generate_types_analysis_report(timestamp, include_members)
             else:
                 raise ValueError(f"Tipo de relatório não suportado: {report_type}")
 
@@ -294,7 +375,7 @@ class FileProcessorMCP:
             "summary": {
                 "total_pokemons": aggregations["total_pokemons"],
                 "unique_types": len(aggregations["type_distribution"]),
-                "most_common_type": max(aggregations["type_distribution"].items(), key=lambda x: x[1]),
+                "most_common_type": max(aggregations["type_distribution"].items(), key=itemgetter(1)),
                 "average_stats": {
                     stat: data["mean"]
                     for stat, data in aggregations["stats_summary"].items()
@@ -305,74 +386,73 @@ class FileProcessorMCP:
             "full_aggregations": aggregations
         }
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        _write_json(filepath, report_data)
 
         logger.info(f"Relatório resumido gerado: {filepath}")
         return str(filepath)
 
     async def _generate_detailed_report(self, timestamp: str) -> str:
         """
-        Gera relatório detalhado em CSV.
+        Gera relatório detalhado: dados completos em Arrow/Feather e
+        agregações em JSON.
         """
-        # Exportar dados completos
-        csv_path = await self.export_to_csv(f"detailed_report_{timestamp}.csv")
-
-        # Gerar agregações
-        aggregations = await self.generate_aggregations()
+        # Exportar dados completos e gerar agregações em paralelo: são
+        # consultas independentes, em conexões distintas do pool
+        data_path, aggregations = await asyncio.gather(
+            self.export_to_feather(f"detailed_report_{timestamp}.feather"),
+            self.generate_aggregations()
+        )
 
         # Salvar agregações separadamente
         agg_filename = f"detailed_aggregations_{timestamp}.json"
         agg_filepath = self.reports_dir / agg_filename
 
-        with open(agg_filepath, 'w', encoding='utf-8') as f:
-            json.dump({
-                "report_type": "detailed",
-                "generated_at": datetime.now().isoformat(),
-                "data_file": csv_path,
-                "aggregations": aggregations
-            }, f, indent=2, ensure_ascii=False)
+        _write_json(agg_filepath, {
+            "report_type": "detailed",
+            "generated_at": datetime.now().isoformat(),
+            "data_file": data_path,
+            "aggregations": aggregations
+        })
 
         logger.info(f"Relatório detalhado gerado: {agg_filepath}")
         return str(agg_filepath)
 
-    async def _generate_types_analysis_report(self, timestamp: str) -> str:
+    async def _generate_types_analysis_report(self, timestamp: str, include_members: bool = False) -> str:
         """
         Gera relatório de análise por tipos.
+        A lista de pokémons de cada tipo só é incluída com include_members.
         """
-        pokemons, total = await self.db_service.list_pokemons(skip=0, limit=10000)
-
-        # Análise por tipo
+        # Uma passada pelos pokémons, à medida que chegam do banco: stats em
+        # linhas de uma matriz e, por tipo, os índices das linhas
+        stat_rows = []
+        type_rows: Dict[str, List[int]] = {}
+        members: Dict[str, List[Dict[str, Any]]] = {}
+        async for pokemon in self.db_service.iter_pokemons(limit=10000):
+            s = pokemon.stats
+            row = len(stat_rows)
+            stat_rows.append((s.hp, s.attack, s.defense, s.special_attack, s.special_defense, s.speed))
+            for type_name in pokemon.type_names:
+                type_rows.setdefault(type_name, []).append(row)
+                if include_members:
+                    members.setdefault(type_name, []).append({
+                        'name': pokemon.name,
+                        'id': pokemon.id,
+                        'stats': s.model_dump()
+                    })
+        total = len(stat_rows)
+
+        # Médias por tipo, somando as linhas de cada tipo de uma vez
+        stats = np.array(stat_rows, dtype=np.int64).reshape(-1, len(STAT_FIELDS))
         type_analysis = {}
-        for pokemon in pokemons:
-            for pokemon_type in pokemon.types:
-                type_name = pokemon_type.name
-                if type_name not in type_analysis:
-                    type_analysis[type_name] = {
-                        'count': 0,
-                        'pokemons': [],
-                        'avg_stats': {'hp': 0, 'attack': 0, 'defense': 0, 'special_attack': 0, 'special_defense': 0, 'speed': 0},
-                        'total_stats': {'hp': 0, 'attack': 0, 'defense': 0, 'special_attack': 0, 'special_defense': 0, 'speed': 0}
-                    }
-
-                type_analysis[type_name]['count'] += 1
-                type_analysis[type_name]['pokemons'].append({
-                    'name': pokemon.name,
-                    'id': pokemon.id,
-                    'stats': pokemon.stats.dict()
-                })
-
-                # Somar stats para calcular média
-                stats_dict = pokemon.stats.dict()
-                for stat_name, stat_value in stats_dict.items():
-                    type_analysis[type_name]['total_stats'][stat_name] += stat_value
-
-        # Calcular médias
-        for type_name, data in type_analysis.items():
-            count = data['count']
-            for stat_name in data['avg_stats'].keys():
-                data['avg_stats'][stat_name] = round(data['total_stats'][stat_name] / count, 2)
-            del data['total_stats']  # Remover totais para economizar espaço
+        for type_name, rows in type_rows.items():
+            count = len(rows)
+            sums = stats[rows].sum(axis=0).tolist()
+            type_analysis[type_name] = {'count': count}
+            if include_members:
+                type_analysis[type_name]['pokemons'] = members[type_name]
+            type_analysis[type_name]['avg_stats'] = {
+                stat_name: round(sums[i] / count, 2) for i, stat_name in enumerate(STAT_FIELDS)
+            }
 
         filename = f"types_analysis_report_{timestamp}.json"
         filepath = self.reports_dir / filename
@@ -385,8 +465,7 @@ class FileProcessorMCP:
             "type_analysis": type_analysis
         }
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        _write_json(filepath, report_data)
 
         logger.info(f"Relatório de análise por tipos gerado: {filepath}")
         return str(filepath)
@@ -430,8 +509,7 @@ class FileProcessorMCP:
         """
         Processa arquivo JSON.
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = orjson.loads(file_path.read_bytes())
 
         # Converter para DataFrame se for lista de pokémons
         if isinstance(data, dict) and 'data' in data:
@@ -483,28 +561,56 @@ class FileProcessorMCP:
     async def _import_from_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Importa dados do DataFrame para o banco de dados.
+        As colunas são convertidas de uma vez; linhas com id ausente ou valores
+        numéricos inválidos são reportadas e as demais gravadas em lote; em
+        uma gravação parcial, as linhas rejeitadas pelo banco também são reportadas.
         """
         imported_count = 0
         errors = []
 
-        for index, row in df.iterrows():
-            try:
-                # Converter linha para formato de pokémon
-                pokemon_data = {
-                    'id': int(row['id']),
-                    'name': str(row['name']).lower().strip(),
-                    'height': int(row.get('height', 0)),
-                    'weight': int(row.get('weight', 0)),
-                    'base_experience': int(row.get('base_experience', 0)) if pd.notna(row.get('base_experience')) else None,
-                    'types': [{'name': t.strip(), 'url': ''} for t in str(row.get('types', '')).split(',') if t.strip()],
-                    'abilities': [{'name': a.strip(), 'url': '', 'is_hidden': False} for a in str(row.get('abilities', '')).split(',') if a.strip()],
+        if 'id' not in df.columns or 'name' not in df.columns:
+            errors.append("Colunas obrigatórias ausentes: id, name")
+            numeric = {}
+            invalid = pd.Series(True, index=df.index)
+        else:
+            # Colunas inteiras convertidas em bloco; ausentes valem 0
+            numeric = {
+                column: pd.to_numeric(df[column], errors='coerce') if column in df.columns
+                else pd.Series(0, index=df.index)
+                for column in IMPORT_INT_COLUMNS
+            }
+            invalid = pd.concat(numeric.values(), axis=1).isna().any(axis=1)
+
+        for index in df.index[invalid]:
+            errors.append(f"Linha {index + 1}: valor numérico ausente ou inválido")
+
+        valid = ~invalid
+        if valid.any():
+            ints = {column: values[valid].astype(int).tolist() for column, values in numeric.items()}
+            names = df.loc[valid, 'name'].astype(str).str.lower().str.strip().tolist()
+            base_experience = (
+                pd.to_numeric(df.loc[valid, 'base_experience'], errors='coerce').tolist()
+                if 'base_experience' in df.columns else [None] * len(names)
+            )
+            types = _split_names(df.loc[valid], 'types')
+            abilities = _split_names(df.loc[valid], 'abilities')
+
+            rows = [
+                {
+                    'id': ints['id'][i],
+                    'name': names[i],
+                    'height': ints['height'][i],
+                    'weight': ints['weight'][i],
+                    'base_experience': None if pd.isna(base_experience[i]) else int(base_experience[i]),
+                    'types': [{'name': t, 'url': ''} for t in types[i]],
+                    'abilities': [{'name': a, 'url': '', 'is_hidden': False} for a in abilities[i]],
                     'stats': {
-                        'hp': int(row.get('hp', 0)),
-                        'attack': int(row.get('attack', 0)),
-                        'defense': int(row.get('defense', 0)),
-                        'special-attack': int(row.get('special_attack', 0)),
-                        'special-defense': int(row.get('special_defense', 0)),
-                        'speed': int(row.get('speed', 0))
+                        'hp': ints['hp'][i],
+                        'attack': ints['attack'][i],
+                        'defense': ints['defense'][i],
+                        'special-attack': ints['special_attack'][i],
+                        'special-defense': ints['special_defense'][i],
+                        'speed': ints['speed'][i]
                     },
                     'sprites': {
                         'front_default': None,
@@ -513,12 +619,22 @@ class FileProcessorMCP:
                         'back_shiny': None
                     }
                 }
+                for i in range(len(names))
+            ]
 
-                await self.db_service.save_pokemon(pokemon_data)
-                imported_count += 1
-
+            try:
+                await self.db_service.save_pokemons(rows)
+                imported_count = len(rows)
+            except BulkWriteError as e:
+                # Gravação parcial: as linhas sem erro já estão no banco
+                imported_count = e.details["nUpserted"] + e.details["nMatched"]
+                row_numbers = df.index[valid]
+                for error in e.details["writeErrors"]:
+                    errors.append(f"Linha {row_numbers[error['index']] + 1}: {error['errmsg']}")
+                if e.details["writeConcernErrors"]:
+                    errors.append(f"Write concern não atendido: {e.details['writeConcernErrors'][0].get('errmsg')}")
             except Exception as e:
-                errors.append(f"Linha {index + 1}: {str(e)}")
+                errors.append(f"Erro ao gravar no banco: {str(e)}")
 
         return {
             "imported_count": imported_count,
@@ -1,6 +1,6 @@
 import logging
 from typing import List, Optional, Tuple, Dict, Any
-from datetime import datetime
+from datetime import UTC, datetime
 
 from app.models.pokemon import Pokemon
 from app.services.database import DatabaseService
@@ -15,9 +15,10 @@ class PokemonService:
     Integra Agnos Client e Database Service.
     """
     
-    def __init__(self, db_service: DatabaseService):
+    def __init__(self, db_service: DatabaseService, agnos_client: Optional[AgnosClient] = None):
         self.db_service = db_service
-        self.agnos_client = AgnosClient()
+        # AgnosClient compartilhado (criado no lifespan da aplicação)
+        self.agnos_client = agnos_client if agnos_client is not None else AgnosClient()
     
     async def fetch_pokemon_from_api(self, pokemon_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -151,14 +152,19 @@ class PokemonService:
             logger.error(f"Error getting pokemon by name {name}: {str(e)}")
             raise
     
-    async def list_pokemons(self, skip: int = 0, limit: int = 100) -> Tuple[List[Pokemon], int]:
+    async def list_pokemons(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None
+    ) -> Tuple[List[Pokemon], int]:
         """
-        Lista pokémons com paginação.
+        Lista pokémons com paginação (por cursor `after` ou, legado, por `skip`).
         """
         try:
-            logger.info(f"Listing pokemons with skip={skip}, limit={limit}")
+            logger.info(f"Listing pokemons with after={after}, skip={skip}, limit={limit}")
             
-            pokemons, total = await self.db_service.list_pokemons(skip=skip, limit=limit)
+            pokemons, total = await self.db_service.list_pokemons(skip=skip, limit=limit, after=after)
             
             logger.info(f"Retrieved {len(pokemons)} pokemons out of {total} total")
             return pokemons, total
@@ -215,7 +221,7 @@ class PokemonService:
                 "overall_status": overall_status,
                 "agnos": agnos_health,
                 "database": db_health,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.now(UTC).isoformat()
             }
             
         except Exception as e:
@@ -223,5 +229,5 @@ class PokemonService:
             return {
                 "overall_status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.now(UTC).isoformat()
             }
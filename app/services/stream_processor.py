@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from typing import Dict, Any, List, Optional, Callable
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from collections import deque
 import json
 from pathlib import Path
@@ -19,9 +19,11 @@ class StreamProcessorMCP:
     Detecta anomalias e dispara alertas automáticos.
     """
     
-    def __init__(self, db_service: DatabaseService):
+    def __init__(self, db_service: DatabaseService, alert_system: Optional[AlertSystem] = None):
         self.db_service = db_service
-        self.alert_system = AlertSystem()
+        # AlertSystem compartilhado (criado no lifespan da aplicação): um único
+        # arquivo de alertas aberto e os alertas do stream no histórico de /alerts
+        self.alert_system = alert_system if alert_system is not None else AlertSystem()
         self.is_running = False
         self.processing_interval = 5  # segundos
         self.anomaly_rules = self._initialize_anomaly_rules()
@@ -89,11 +91,11 @@ class StreamProcessorMCP:
             }
         ]
 
-    def _clean_processed_cache(self):
+    def _clean_processed_cache(self, current_time: Optional[datetime] = None):
         """
         Remove entradas antigas do cache de pokémons processados.
         """
-        current_time = datetime.utcnow()
+        current_time = current_time or datetime.now(UTC)
         expired_keys = []
 
         for pokemon_id, last_processed in self.processed_pokemons.items():
@@ -103,11 +105,11 @@ class StreamProcessorMCP:
         for key in expired_keys:
             del self.processed_pokemons[key]
 
-    def _should_process_pokemon(self, pokemon: Pokemon) -> bool:
+    def _should_process_pokemon(self, pokemon: Pokemon, current_time: Optional[datetime] = None) -> bool:
         """
         Verifica se um pokémon deve ser processado baseado no cache.
         """
-        current_time = datetime.utcnow()
+        current_time = current_time or datetime.now(UTC)
         last_processed = self.processed_pokemons.get(pokemon.id)
 
         if last_processed is None:
@@ -126,7 +128,7 @@ class StreamProcessorMCP:
             return
         
         self.is_running = True
-        self.metrics['start_time'] = datetime.utcnow()
+        self.metrics['start_time'] = datetime.now(UTC)
         logger.info("Iniciando stream processor")
         
         try:
@@ -150,11 +152,15 @@ class StreamProcessorMCP:
         Processa um lote de dados em tempo real.
         """
         try:
+            # Um único instante para todo o lote (e sua forma ISO, usada nos eventos)
+            batch_time = datetime.now(UTC)
+            batch_timestamp = batch_time.isoformat()
+
             # Limpar cache de pokémons processados
-            self._clean_processed_cache()
+            self._clean_processed_cache(batch_time)
 
             # Buscar pokémons modificados recentemente (últimos 5 minutos)
-            cutoff_time = datetime.utcnow() - timedelta(minutes=5)
+            cutoff_time = batch_time - timedelta(minutes=5)
 
             # Simular stream - na prática, isso viria de um sistema de streaming real
             recent_pokemons = await self._get_recent_pokemons(cutoff_time)
@@ -165,7 +171,7 @@ class StreamProcessorMCP:
             # Filtrar pokémons que já foram processados recentemente
             pokemons_to_process = [
                 pokemon for pokemon in recent_pokemons
-                if self._should_process_pokemon(pokemon)
+                if self._should_process_pokemon(pokemon, batch_time)
             ]
 
             if not pokemons_to_process:
@@ -175,12 +181,12 @@ class StreamProcessorMCP:
             logger.info(f"Processando {len(pokemons_to_process)} pokémons no stream (de {len(recent_pokemons)} candidatos)")
 
             for pokemon in pokemons_to_process:
-                await self._process_pokemon_stream(pokemon)
+                await self._process_pokemon_stream(pokemon, batch_timestamp)
                 self.metrics['processed_count'] += 1
                 # Marcar como processado
-                self.processed_pokemons[pokemon.id] = datetime.utcnow()
+                self.processed_pokemons[pokemon.id] = batch_time
 
-            self.metrics['last_processed'] = datetime.utcnow()
+            self.metrics['last_processed'] = datetime.now(UTC)
 
         except Exception as e:
             logger.error(f"Erro no processamento do lote: {str(e)}")
@@ -205,9 +211,10 @@ class StreamProcessorMCP:
             logger.error(f"Erro ao buscar pokémons recentes: {str(e)}")
             return []
     
-    async def _process_pokemon_stream(self, pokemon: Pokemon):
+    async def _process_pokemon_stream(self, pokemon: Pokemon, timestamp: Optional[str] = None):
         """
         Processa um pokémon individual no stream.
+        `timestamp` é o instante do lote, em ISO; sem ele, usa o horário atual.
         """
         try:
             anomalies = await self._detect_anomalies(pokemon)
@@ -218,7 +225,7 @@ class StreamProcessorMCP:
             
             # Registrar evento
             event = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': timestamp or datetime.now(UTC).isoformat(),
                 'pokemon_id': pokemon.id,
                 'pokemon_name': pokemon.name,
                 'anomalies_count': len(anomalies),
@@ -296,9 +303,9 @@ class StreamProcessorMCP:
         Verifica stats negativos.
         """
         negative_stats = []
-        stats_dict = pokemon.stats.dict()
         
-        for stat_name, stat_value in stats_dict.items():
+        # Leitura direta dos campos, sem a cópia feita por model_dump()
+        for stat_name, stat_value in pokemon.stats.__dict__.items():
             if stat_value < 0:
                 negative_stats.append(f"{stat_name}={stat_value}")
         
@@ -321,9 +328,8 @@ class StreamProcessorMCP:
         Verifica stats extremos.
         """
         extreme_stats = []
-        stats_dict = pokemon.stats.dict()
         
-        for stat_name, stat_value in stats_dict.items():
+        for stat_name, stat_value in pokemon.stats.__dict__.items():
             if stat_name in self.stat_thresholds:
                 thresholds = self.stat_thresholds[stat_name]
                 if stat_value < thresholds['min'] or stat_value > thresholds['max']:
@@ -389,7 +395,7 @@ class StreamProcessorMCP:
         """
         uptime = None
         if self.metrics['start_time']:
-            uptime = (datetime.utcnow() - self.metrics['start_time']).total_seconds()
+            uptime = (datetime.now(UTC) - self.metrics['start_time']).total_seconds()
         
         return {
             'is_running': self.is_running,
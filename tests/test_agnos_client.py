@@ -0,0 +1,112 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.agnos_client import AgnosClient, _UpstreamError
+from app.services.cache import TTLCache
+
+
+PIKACHU = {"id": 25, "name": "pikachu"}
+
+
+class TestTTLCache:
+    """
+    Testes do cache em memória com expiração.
+    """
+
+    def test_get_and_expire(self):
+        """Testa que a entrada expira após o TTL, mas continua em get_stale."""
+        cache = TTLCache(maxsize=10, ttl=60.0)
+        with patch("app.services.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+            assert cache.get("a") == 1
+        with patch("app.services.cache.time.monotonic", return_value=161.0):
+            assert cache.get("a") is None
+            assert cache.get_stale("a") == 1
+
+    def test_per_entry_ttl(self):
+        """Testa o TTL informado em set, que prevalece sobre o padrão."""
+        cache = TTLCache(maxsize=10, ttl=60.0)
+        with patch("app.services.cache.time.monotonic", return_value=100.0):
+            cache.set("a", None, ttl=5.0)
+        with patch("app.services.cache.time.monotonic", return_value=104.0):
+            assert cache.get("a", "missing") is None
+        with patch("app.services.cache.time.monotonic", return_value=106.0):
+            assert cache.get("a", "missing") == "missing"
+
+    def test_evicts_least_recently_used(self):
+        """Testa o descarte da entrada menos usada ao passar de maxsize."""
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("a") == 1
+        assert cache.get_stale("b") is None
+
+
+class TestAgnosClientCache:
+    """
+    Testes do cache e do fallback do Pokémon MCP.
+    """
+
+    def setup_method(self):
+        """Setup para cada teste."""
+        self.cache = TTLCache(maxsize=10, ttl=60.0)
+        self.client = AgnosClient(http_client=AsyncMock(), cache=self.cache)
+
+    @pytest.mark.asyncio
+    async def test_cache_hit(self):
+        """Testa que a segunda chamada é servida do cache, sem nova consulta."""
+        with patch.object(self.client, "_fetch_pokemon", AsyncMock(return_value=PIKACHU)) as mock_fetch:
+            assert await self.client.call_pokemon_mcp("Pikachu") == PIKACHU
+            assert await self.client.call_pokemon_mcp("pikachu") == PIKACHU
+
+        mock_fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_negative_cache(self):
+        """Testa que pokémons inexistentes ficam em cache pelo TTL negativo."""
+        self.client.negative_cache_ttl = 30.0
+        with patch.object(self.client, "_fetch_pokemon", AsyncMock(return_value=None)) as mock_fetch:
+            with patch("app.services.cache.time.monotonic", return_value=100.0):
+                assert await self.client.call_pokemon_mcp("missingno") is None
+                assert await self.client.call_pokemon_mcp("missingno") is None
+            assert mock_fetch.await_count == 1
+
+            with patch("app.services.cache.time.monotonic", return_value=131.0):
+                assert await self.client.call_pokemon_mcp("missingno") is None
+            assert mock_fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_fallback_on_upstream_error(self):
+        """Testa que uma falha na origem devolve o último dado conhecido."""
+        with patch("app.services.cache.time.monotonic", return_value=100.0):
+            self.cache.set("pokemcp:pikachu", PIKACHU)
+
+        with patch.object(self.client, "_fetch_pokemon", AsyncMock(side_effect=_UpstreamError())):
+            with patch("app.services.cache.time.monotonic", return_value=1000.0):
+                assert await self.client.call_pokemon_mcp("pikachu") == PIKACHU
+
+    @pytest.mark.asyncio
+    async def test_upstream_error_without_cache(self):
+        """Testa que uma falha na origem sem dado em cache devolve None e não é cacheada."""
+        with patch.object(self.client, "_fetch_pokemon", AsyncMock(side_effect=_UpstreamError())):
+            assert await self.client.call_pokemon_mcp("pikachu") is None
+
+        assert len(self.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_health_check_bypasses_cache(self):
+        """Testa que o health check consulta a origem mesmo com o pokémon em cache."""
+        self.cache.set("pokemcp:pikachu", PIKACHU)
+
+        with patch.object(self.client, "_fetch_pokemon", AsyncMock(side_effect=_UpstreamError())):
+            result = await self.client.health_check()
+
+        assert result["pokemon_mcp"] == "unhealthy"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -5,6 +5,23 @@ from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch
 
 from app.main import app
+from app.models.pokemon import Pokemon
+from app.services.pokemon_service import PokemonService
+
+
+def _make_pokemon(pokemon_id: int, name: str) -> Pokemon:
+    """Cria um pokémon mínimo para os testes de listagem."""
+    return Pokemon(
+        id=pokemon_id,
+        name=name,
+        height=4,
+        weight=60,
+        base_experience=112,
+        types=[{"name": "electric", "url": "https://pokeapi.co/api/v2/type/13/"}],
+        abilities=[],
+        stats={"hp": 35, "attack": 55, "defense": 40, "special-attack": 50, "special-defense": 50, "speed": 90},
+        sprites={}
+    )
 
 
 class TestPokemonAPI:
@@ -14,11 +31,18 @@ class TestPokemonAPI:
     
     def setup_method(self):
         """Setup para cada teste."""
+        # Sem o lifespan (que conecta ao MongoDB), o serviço é criado aqui;
+        # os testes substituem seus métodos com patch
+        app.state.pokemon_service = PokemonService(AsyncMock(), AsyncMock())
         self.client = TestClient(app)
     
+    def teardown_method(self):
+        """Remove o serviço criado para o teste."""
+        del app.state.pokemon_service
+    
     def test_root_endpoint(self):
-        """Testa o endpoint raiz."""
-        response = self.client.get("/")
+        """Testa o endpoint de informações da API."""
+        response = self.client.get("/api")
         assert response.status_code == 200
         data = response.json()
         assert data["message"] == "Pokemon Agent API"
@@ -107,6 +131,33 @@ class TestPokemonAPI:
         assert len(data["data"]) == 1
         assert data["data"][0]["name"] == "pikachu"
     
+    @patch('app.services.pokemon_service.PokemonService.list_pokemons')
+    def test_list_pokemons_next_cursor(self, mock_list):
+        """Testa o cursor da próxima página quando a página vem cheia."""
+        mock_list.return_value = ([_make_pokemon(1, "bulbasaur"), _make_pokemon(4, "charmander")], 10)
+        
+        response = self.client.get("/api/v1/pokemons?after=abra&limit=2")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["next_cursor"] == "charmander"
+        assert data["total_is_estimate"] is True
+        mock_list.assert_awaited_once_with(skip=0, limit=2, after="abra")
+    
+    @patch('app.services.pokemon_service.PokemonService.list_pokemons')
+    def test_list_pokemons_last_page(self, mock_list):
+        """Testa a última página: sem cursor e com os stats pelos aliases."""
+        mock_list.return_value = ([_make_pokemon(25, "pikachu")], 10)
+        
+        response = self.client.get("/api/v1/pokemons?after=charmander&limit=2")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["next_cursor"] is None
+        stats = data["data"][0]["stats"]
+        assert stats["special-attack"] == 50
+        assert "special_attack" not in stats
+    
     @patch('app.services.pokemon_service.PokemonService.get_pokemon_by_name')
     def test_get_pokemon_by_name_success(self, mock_get):
         """Testa busca de pokémon por nome - sucesso."""
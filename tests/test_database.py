@@ -0,0 +1,229 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo.errors import BulkWriteError
+
+from app.services.database import DatabaseService
+
+
+STATS = {"hp": 35, "attack": 55, "defense": 40, "special-attack": 50, "special-defense": 50, "speed": 90}
+
+
+class FakeCursor:
+    """Cursor do Motor em memória, que registra as opções recebidas."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.options = {}
+
+    def sort(self, key, direction):
+        self.options["sort"] = (key, direction)
+        return self
+
+    def skip(self, skip):
+        self.options["skip"] = skip
+        return self
+
+    def limit(self, limit):
+        self.options["limit"] = limit
+        return self
+
+    def batch_size(self, size):
+        self.options["batch_size"] = size
+        return self
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+def _make_service(aggregate_result=None, docs=()):
+    """Cria o DatabaseService com uma coleção falsa, sem conectar ao MongoDB."""
+    service = DatabaseService()
+    service.pokemon_collection = MagicMock()
+    service.pokemon_collection.aggregate.return_value.to_list = AsyncMock(return_value=[aggregate_result])
+    service.pokemon_collection.estimated_document_count = AsyncMock(return_value=len(docs))
+    service.pokemon_collection.find.return_value = FakeCursor(list(docs))
+    return service
+
+
+def _doc(name):
+    """Documento mínimo de pokémon como gravado no banco."""
+    return {"id": 1, "name": name, "height": 7, "weight": 69, "types": [], "abilities": [], "stats": STATS, "sprites": {}}
+
+
+class TestCursorPagination:
+    """
+    Testes da paginação por cursor de list_pokemons.
+    """
+
+    @pytest.mark.asyncio
+    async def test_after_uses_name_range(self):
+        """Testa que o cursor vira um filtro por nome, sem skip."""
+        service = _make_service(docs=[_doc("charmander")])
+
+        pokemons, total = await service.list_pokemons(limit=2, after="bulbasaur")
+
+        query = service.pokemon_collection.find.call_args.args[0]
+        assert query == {"name": {"$gt": "bulbasaur"}}
+        assert service.pokemon_collection.find.return_value.options == {"sort": ("name", 1), "limit": 2, "batch_size": 2}
+        assert [pokemon.name for pokemon in pokemons] == ["charmander"]
+        assert total == 1
+
+    @pytest.mark.asyncio
+    async def test_first_page_without_cursor(self):
+        """Testa a primeira página: sem filtro e sem skip."""
+        service = _make_service(docs=[])
+
+        await service.list_pokemons(limit=100)
+
+        assert service.pokemon_collection.find.call_args.args[0] == {}
+        assert "skip" not in service.pokemon_collection.find.return_value.options
+
+
+class TestStatsAggregates:
+    """
+    Testes do $facet de get_stats_aggregates.
+    """
+
+    @pytest.mark.asyncio
+    async def test_pipeline_shape(self):
+        """Testa a mediana (elemento central do array ordenado) e os tops ordenados com desempate por nome."""
+        service = _make_service({"summary": [], "types": [], "top_attack": []})
+
+        await service.get_stats_aggregates(("hp", "special_attack"), ("attack",), 5)
+
+        pipeline = service.pokemon_collection.aggregate.call_args.args[0]
+        facets = pipeline[0]["$facet"]
+        group, project = facets["summary"][0]["$group"], facets["summary"][1]["$project"]
+        assert group["hp_values"] == {"$push": "$stats.hp"}
+        assert group["special_attack_mean"] == {"$avg": {"$ifNull": ["$stats.special_attack", "$stats.special-attack"]}}
+        assert project["hp"]["median"] == {"$arrayElemAt": [
+            {"$sortArray": {"input": "$hp_values", "sortBy": 1}},
+            {"$toInt": {"$floor": {"$divide": ["$count", 2]}}}
+        ]}
+        assert facets["top_attack"][:2] == [{"$sort": {"stats.attack": -1, "name": 1}}, {"$limit": 5}]
+
+    @pytest.mark.asyncio
+    async def test_result_post_processing(self):
+        """Testa a conversão do resultado do $facet."""
+        service = _make_service({
+            "summary": [{"count": 3, "hp": {"mean": 50.0, "min": 40, "max": 60, "median": 50}}],
+            "types": [{"_id": "fire", "count": 2}, {"_id": "water", "count": 1}],
+            "top_attack": [{"name": "charizard", "attack": 84}]
+        })
+
+        result = await service.get_stats_aggregates(("hp",), ("attack",), 5)
+
+        assert result == {
+            "total": 3,
+            "stats": {"hp": {"mean": 50.0, "min": 40, "max": 60, "median": 50}},
+            "type_counts": {"fire": 2, "water": 1},
+            "top_attack": [{"name": "charizard", "attack": 84}]
+        }
+
+    @pytest.mark.asyncio
+    async def test_empty_collection(self):
+        """Testa o resultado com a coleção vazia."""
+        service = _make_service({"summary": [], "types": [], "top_attack": []})
+
+        result = await service.get_stats_aggregates(("hp",), ("attack",), 5)
+
+        assert result["total"] == 0
+        assert result["stats"] == {}
+
+    @pytest.mark.asyncio
+    async def test_summary_exact_total(self):
+        """Testa que o resumo do dashboard traz a contagem exata do $facet."""
+        service = _make_service({
+            "generations": [{"_id": 1, "count": 2}],
+            "total": [{"count": 3}],
+            "experience": [{"_id": None, "count": 2, "sum": 200}],
+            "types": [{"count": 4}]
+        })
+
+        result = await service.get_summary_aggregates([1, 152])
+
+        assert result == {
+            "generation_counts": {1: 2},
+            "total_count": 3,
+            "experience_count": 2,
+            "experience_sum": 200,
+            "unique_types": 4
+        }
+
+
+class TestSavePokemons:
+    """
+    Testes da gravação em lote de save_pokemons.
+    """
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_failure(self):
+        """Testa que um lote com erros não interrompe os seguintes e que os índices são globais."""
+        service = _make_service()
+        service.pokemon_collection.bulk_write = AsyncMock(side_effect=[
+            BulkWriteError({
+                "nUpserted": 1, "nMatched": 0,
+                "writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}],
+                "writeConcernErrors": []
+            }),
+            MagicMock(upserted_count=1, matched_count=1)
+        ])
+        invalidate = MagicMock()
+        service.add_invalidator(invalidate)
+
+        with patch("app.services.database.SAVE_BATCH_SIZE", 2):
+            with pytest.raises(BulkWriteError) as error:
+                await service.save_pokemons([_doc(name) for name in ("a", "b", "c", "d")])
+
+        assert service.pokemon_collection.bulk_write.await_count == 2
+        assert error.value.details["nUpserted"] == 2
+        assert error.value.details["nMatched"] == 1
+        assert [e["index"] for e in error.value.details["writeErrors"]] == [1]
+        invalidate.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_all_batches_saved(self):
+        """Testa os totais retornados quando todos os lotes são gravados."""
+        service = _make_service()
+        service.pokemon_collection.bulk_write = AsyncMock(return_value=MagicMock(upserted_count=2, matched_count=0))
+
+        with patch("app.services.database.SAVE_BATCH_SIZE", 2):
+            result = await service.save_pokemons([_doc(name) for name in ("a", "b", "c", "d")])
+
+        assert result == {"inserted": 4, "updated": 0}
+
+
+class TestNameIndexCheck:
+    """
+    Testes do aviso de índice único de nome ausente.
+    """
+
+    @pytest.mark.asyncio
+    async def test_warns_when_missing(self, caplog):
+        """Testa o aviso quando só existe o índice de _id."""
+        service = _make_service()
+        service.pokemon_collection.index_information = AsyncMock(return_value={
+            "_id_": {"key": [("_id", 1)]}
+        })
+
+        await service._check_name_index()
+
+        assert "app.migrate" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_silent_when_present(self, caplog):
+        """Testa que não há aviso com o índice único de nome."""
+        service = _make_service()
+        service.pokemon_collection.index_information = AsyncMock(return_value={
+            "_id_": {"key": [("_id", 1)]},
+            "name_1": {"key": [("name", 1)], "unique": True}
+        })
+
+        await service._check_name_index()
+
+        assert "app.migrate" not in caplog.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,143 @@
+import pandas as pd
+import pytest
+from unittest.mock import AsyncMock, patch
+from pymongo.errors import BulkWriteError
+
+from app.services.database import DatabaseService
+from app.services.file_processor import AGGREGATIONS_MAX_AGE, FileProcessorMCP
+
+
+def _stats_aggregates(total):
+    """Resultado de get_stats_aggregates com o total informado."""
+    return {
+        "total": total,
+        "stats": {"hp": {"mean": 45.678, "min": 40, "max": 50, "median": 45}},
+        "type_counts": {"grass": total},
+        "top_attack": [], "top_defense": [], "top_speed": []
+    }
+
+
+class TestAggregationsCache:
+    """
+    Testes do cache de generate_aggregations.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_file_processor(self, tmp_path, monkeypatch):
+        """Setup para cada teste; os diretórios de dados ficam em um diretório temporário."""
+        monkeypatch.chdir(tmp_path)
+        self.db_service = DatabaseService()
+        self.db_service.get_stats_aggregates = AsyncMock(return_value=_stats_aggregates(3))
+        self.file_proc = FileProcessorMCP(self.db_service)
+
+    @pytest.mark.asyncio
+    async def test_cached_until_write(self):
+        """Testa que o resultado é reaproveitado até uma escrita no banco."""
+        first = await self.file_proc.generate_aggregations()
+        second = await self.file_proc.generate_aggregations()
+
+        assert second is first
+        assert first["total_pokemons"] == 3
+        assert first["stats_summary"]["hp"]["mean"] == 45.68
+        assert self.db_service.get_stats_aggregates.await_count == 1
+
+        self.db_service.get_stats_aggregates.return_value = _stats_aggregates(4)
+        self.db_service._notify_write()
+
+        third = await self.file_proc.generate_aggregations()
+        assert third["total_pokemons"] == 4
+        assert self.db_service.get_stats_aggregates.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_expires_after_max_age(self):
+        """Testa que o cache expira após AGGREGATIONS_MAX_AGE mesmo sem escritas."""
+        with patch("app.services.file_processor.time.monotonic", return_value=1000.0):
+            await self.file_proc.generate_aggregations()
+        with patch("app.services.file_processor.time.monotonic", return_value=1000.0 + AGGREGATIONS_MAX_AGE - 1):
+            await self.file_proc.generate_aggregations()
+        assert self.db_service.get_stats_aggregates.await_count == 1
+
+        with patch("app.services.file_processor.time.monotonic", return_value=1000.0 + AGGREGATIONS_MAX_AGE):
+            await self.file_proc.generate_aggregations()
+        assert self.db_service.get_stats_aggregates.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_write_during_computation_is_not_cached(self):
+        """Testa que um resultado calculado durante uma escrita não fica em cache."""
+        async def aggregate_with_concurrent_write(*args):
+            self.db_service._notify_write()
+            return _stats_aggregates(3)
+
+        self.db_service.get_stats_aggregates.side_effect = aggregate_with_concurrent_write
+
+        await self.file_proc.generate_aggregations()
+        await self.file_proc.generate_aggregations()
+
+        assert self.db_service.get_stats_aggregates.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_collection(self):
+        """Testa a resposta sem pokémons no banco."""
+        self.db_service.get_stats_aggregates.return_value = _stats_aggregates(0)
+
+        result = await self.file_proc.generate_aggregations()
+
+        assert result == {"message": "Nenhum pokémon encontrado", "aggregations": {}}
+
+
+class TestImportFromDataFrame:
+    """
+    Testes da importação de linhas de CSV/JSON para o banco.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_file_processor(self, tmp_path, monkeypatch):
+        """Setup para cada teste; os diretórios de dados ficam em um diretório temporário."""
+        monkeypatch.chdir(tmp_path)
+        self.db_service = DatabaseService()
+        self.db_service.save_pokemons = AsyncMock()
+        self.file_proc = FileProcessorMCP(self.db_service)
+
+    @staticmethod
+    def _dataframe():
+        """Três linhas, a segunda com id inválido."""
+        return pd.DataFrame({
+            "id": [1, "x", 4],
+            "name": ["Bulbasaur", "Ivysaur", "Bulbasaur"],
+            "height": [7, 10, 6], "weight": [69, 130, 85],
+            "hp": [45, 60, 39], "attack": [49, 62, 52], "defense": [49, 63, 43],
+            "special_attack": [65, 80, 60], "special_defense": [65, 80, 50], "speed": [45, 60, 65],
+            "types": ["grass,poison", "grass", "fire"]
+        })
+
+    @pytest.mark.asyncio
+    async def test_import(self):
+        """Testa a importação das linhas válidas e o relato das inválidas."""
+        result = await self.file_proc._import_from_dataframe(self._dataframe())
+
+        rows = self.db_service.save_pokemons.await_args.args[0]
+        assert [row["name"] for row in rows] == ["bulbasaur", "bulbasaur"]
+        assert rows[0]["types"] == [{"name": "grass", "url": ""}, {"name": "poison", "url": ""}]
+        assert result["imported_count"] == 2
+        assert result["errors"] == ["Linha 2: valor numérico ausente ou inválido"]
+
+    @pytest.mark.asyncio
+    async def test_partial_write(self):
+        """Testa que uma gravação parcial conta as linhas gravadas e aponta a linha rejeitada."""
+        self.db_service.save_pokemons.side_effect = BulkWriteError({
+            "nUpserted": 1, "nMatched": 0,
+            "writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}],
+            "writeConcernErrors": []
+        })
+
+        result = await self.file_proc._import_from_dataframe(self._dataframe())
+
+        assert result["imported_count"] == 1
+        assert result["errors"] == [
+            "Linha 2: valor numérico ausente ou inválido",
+            "Linha 3: duplicate key"
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,47 @@
+import pytest
+
+from app.models.pokemon import Pokemon
+
+
+def _make_pokemon(**overrides) -> Pokemon:
+    """Cria um pokémon mínimo para os testes do modelo."""
+    data = {
+        "id": 6,
+        "name": "charizard",
+        "height": 17,
+        "weight": 905,
+        "types": [{"name": "fire", "url": ""}, {"name": "flying", "url": ""}],
+        "abilities": [],
+        "stats": {"hp": 78, "attack": 84, "defense": 78, "special-attack": 109, "special-defense": 85, "speed": 100},
+        "sprites": {}
+    }
+    data.update(overrides)
+    return Pokemon(**data)
+
+
+class TestPokemonModel:
+    """
+    Testes do modelo Pokemon.
+    """
+
+    def test_type_names(self):
+        """Testa os nomes dos tipos, na ordem recebida."""
+        assert _make_pokemon().type_names == ("fire", "flying")
+
+    def test_equality_after_reading_type_names(self):
+        """Testa que ler type_names não altera a igualdade com uma cópia dos dados."""
+        pokemon = _make_pokemon()
+        pokemon.type_names
+
+        assert pokemon == Pokemon(**pokemon.model_dump())
+
+    def test_type_names_not_serialized(self):
+        """Testa que type_names não aparece na serialização."""
+        pokemon = _make_pokemon()
+
+        assert "type_names" not in pokemon.model_dump()
+        assert "_type_names" not in pokemon.model_dump_json()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,89 @@
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock
+
+from app.main import app
+
+PIPELINE = "/api/v1/pipeline"
+
+
+class TestConditionalResponses:
+    """
+    Testes das respostas com ETag e 304 das rotas do pipeline.
+    """
+
+    def setup_method(self):
+        """Setup para cada teste."""
+        # Sem o lifespan, os serviços usados pelas rotas são substituídos por mocks
+        app.state.file_processor = AsyncMock()
+        app.state.file_processor.generate_aggregations.return_value = {"total_pokemons": 3}
+        app.state.dashboard_service = AsyncMock()
+        app.state.dashboard_service.get_dashboard_json.return_value = b'{"summary":{"total_pokemons":3}}'
+        app.state.stream_processor = AsyncMock()
+        app.state.stream_processor.get_stream_status.return_value = {"is_running": False, "uptime_seconds": 1.5}
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Remove os serviços criados para o teste."""
+        del app.state.file_processor
+        del app.state.dashboard_service
+        del app.state.stream_processor
+
+    def test_aggregations_etag(self):
+        """Testa que a resposta traz ETag e o corpo JSON."""
+        response = self.client.get(PIPELINE + "/file/aggregations")
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert response.json() == {"success": True, "aggregations": {"total_pokemons": 3}}
+
+    def test_aggregations_not_modified(self):
+        """Testa o 304 quando o cliente já possui o mesmo conteúdo."""
+        etag = self.client.get(PIPELINE + "/file/aggregations").headers["etag"]
+
+        response = self.client.get(PIPELINE + "/file/aggregations", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    def test_not_modified_weak_and_multiple_etags(self):
+        """Testa o 304 com ETag fraco no meio de uma lista de ETags."""
+        etag = self.client.get(PIPELINE + "/file/aggregations").headers["etag"]
+
+        response = self.client.get(PIPELINE + "/file/aggregations", headers={"If-None-Match": f'"outro", W/{etag}'})
+
+        assert response.status_code == 304
+
+    def test_changed_content_returns_body(self):
+        """Testa que um ETag antigo não impede a resposta com o novo conteúdo."""
+        etag = self.client.get(PIPELINE + "/file/aggregations").headers["etag"]
+        app.state.file_processor.generate_aggregations.return_value = {"total_pokemons": 4}
+
+        response = self.client.get(PIPELINE + "/file/aggregations", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["aggregations"]["total_pokemons"] == 4
+
+    def test_dashboard_data_prebuilt_body(self):
+        """Testa a resposta montada a partir do JSON já serializado do dashboard."""
+        response = self.client.get(PIPELINE + "/dashboard/data")
+
+        assert response.status_code == 200
+        assert response.json() == {"success": True, "dashboard": {"summary": {"total_pokemons": 3}}}
+
+        cached = self.client.get(PIPELINE + "/dashboard/data", headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+
+    def test_volatile_status_without_etag(self):
+        """Testa que o status do stream, que inclui o uptime, não recebe ETag."""
+        response = self.client.get(PIPELINE + "/stream/status")
+
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.json()["status"]["uptime_seconds"] == 1.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])